@@ -3,20 +3,196 @@
 import html
 import io
 import csv
-from typing import List
+import functools
+import json
+import threading
+import time
+from typing import List, Optional
+
+# Measured from the earliest point we control, for the cold-start log line
+_PROCESS_STARTED_AT = time.monotonic()
 
 from fastapi import FastAPI, Form, UploadFile, File, Request
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+
+# torch/transformers are only imported once the model loader runs, so the
+# server can bind and answer health probes before the model is in memory
+from src.summarizer.components.model_loader import ModelNotReadyError
+from src.summarizer.components.model_registry import ModelRegistry, UnknownModelError
+from src.summarizer.components.micro_batcher import MicroBatcher
+from src.summarizer.components.inference_executor import InferenceExecutor, InferenceBusyError
+from src.summarizer.components.csv_batch import DECODE_ERRORS, detect_encoding, iter_summary_csv, plan_csv_duplicates
+from src.summarizer.components.near_dedup import ClusterSummarizer
+from src.summarizer.components.summary_cache import SummaryCache
+from src.summarizer.components.encoder_cache import EncoderCache
+from src.summarizer.components.decoding import DecodingPolicies, UnknownPolicyError, describe, generate_kwargs
+from src.summarizer.components.batch_jobs import BatchJobManager, JobNotFoundError
+from src.summarizer.components import metrics
+from src.summarizer.components.request_logging import RequestLoggingMiddleware
+from src.summarizer.config.configuration import ConfigurationManager
+from src.summarizer.logging import configure_logging
 
-# Use your prediction component - ensure path is correct
-from src.summarizer.components.model_prediction import ModelPrediction
+configure_logging()
 
 app = FastAPI(title="TextSummarizer UI")
 
-# Instantiate model predictor once (loads model into memory)
-predictor = ModelPrediction(model_path="artifacts/model")
+config_manager = ConfigurationManager()
+serving_config = config_manager.get_serving_config()
+cache_config = config_manager.get_summary_cache_config()
+encoder_cache_config = config_manager.get_encoder_cache_config()
+job_config = config_manager.get_batch_job_config()
+dedup_config = config_manager.get_dedup_config()
+long_doc_config = config_manager.get_long_document_config()
+tokenizer_config = config_manager.get_tokenizer_config()
+
+# Greedy / beam / sampling policies chosen per request, with deadline fallbacks
+decoding_policies = DecodingPolicies(config_manager.get_decoding_config())
+# One latency callback per policy, so a micro-batch reports its generate time
+# once per policy rather than once per request
+_observe_policy = {name: functools.partial(decoding_policies.observe, name) for name in decoding_policies.policies}
+
+# Repeated inputs with the same generation settings are answered from cache
+summary_cache = None
+if cache_config.enabled:
+    summary_cache = SummaryCache(
+        max_entries=cache_config.max_entries,
+        max_bytes=cache_config.max_bytes,
+        disk_path=cache_config.disk_path
+    )
+
+# Different lengths for an already seen text reuse its encoder output; shared
+# by all models (entries are keyed by model) so there is one memory budget
+encoder_cache = None
+if encoder_cache_config.enabled:
+    encoder_cache = EncoderCache(
+        max_entries=encoder_cache_config.max_entries,
+        max_bytes=encoder_cache_config.max_bytes
+    )
+
+def _load_predictor(spec):
+    from src.summarizer.components.model_prediction import ModelPrediction
+    return ModelPrediction(
+        model_path=spec.model_path,
+        cache=summary_cache,
+        backend=spec.backend,
+        onnx_dir=spec.onnx_dir,
+        encoder_cache=encoder_cache,
+        tokenizer_config=tokenizer_config
+    )
+
+
+# One loader per configured model: the default loads eagerly, in the
+# background or on first use (serving.load_mode); the others on first request
+model_registry = ModelRegistry(
+    serving_config.models,
+    _load_predictor,
+    default_model=serving_config.default_model,
+    load_mode=serving_config.load_mode,
+    warmup_requests=serving_config.warmup_requests,
+    memory_budget_mb=serving_config.memory_budget_mb,
+    started_at=_PROCESS_STARTED_AT
+)
+model_loader = model_registry.loader()
+
+# Model calls run on a bounded worker pool so the event loop stays responsive
+executor = InferenceExecutor(
+    max_workers=serving_config.inference_workers,
+    max_pending=serving_config.max_pending
+)
+
+def _pretokenize(model, text):
+    # Raises ModelNotReadyError while the model loads; the batcher then lets
+    # the inference worker tokenize as before
+    predictor = model_registry.loader(model).get(wait=False)
+    return predictor.model_id, predictor.pretokenize([text])
+
+
+# Concurrent /api/summarize requests are queued and generated together;
+# each is tokenized on the model's tokenization pool while it waits
+batcher = MicroBatcher(
+    lambda model: model_registry.get(model, wait=True),
+    executor,
+    max_batch_size=serving_config.max_batch_size,
+    max_wait_ms=serving_config.max_wait_ms,
+    max_queue_size=serving_config.max_queue_size,
+    pretokenize=_pretokenize
+)
+
+
+def _summarize_chunk(dialogues):
+    # Used from worker threads (streaming responses, batch jobs); waits for the
+    # model and for an inference slot rather than failing once work has started
+    predictor = model_loader.get(wait=True)
+    return executor.call(predictor.summarize_batch, dialogues, batch_size=serving_config.csv_batch_size,
+                         **generate_kwargs(decoding_policies.get(decoding_policies.batch_policy)))
+
+
+# Large CSVs run as background jobs with on-disk checkpoints
+job_manager = BatchJobManager(
+    _summarize_chunk,
+    jobs_dir=job_config.jobs_dir,
+    max_workers=job_config.max_workers,
+    chunk_rows=job_config.chunk_rows,
+    dedup_config=dedup_config
+)
+
+
+# Scrape-time values for /metrics
+metrics.QUEUE_DEPTH.set_function(lambda: batcher.queue_depth)
+metrics.INFERENCE_PENDING.set_function(lambda: executor.pending)
+if summary_cache is not None:
+    metrics.CACHE_LOOKUPS.set_function(
+        lambda: {("hit",): summary_cache.hits, ("miss",): summary_cache.misses}
+    )
+    metrics.CACHE_HIT_RATE.set_function(lambda: summary_cache.stats()["hit_rate"])
+if encoder_cache is not None:
+    metrics.ENCODER_CACHE_LOOKUPS.set_function(
+        lambda: {("hit",): encoder_cache.hits, ("miss",): encoder_cache.misses}
+    )
+    metrics.ENCODER_CACHE_BYTES.set_function(lambda: encoder_cache.stats()["bytes"])
+app.add_middleware(metrics.MetricsMiddleware, routes=app.routes)
+# Outermost, so everything logged while handling a request carries its id
+app.add_middleware(RequestLoggingMiddleware)
+
+
+@app.on_event("startup")
+async def on_startup():
+    model_registry.start()
+    model_registry.start_watching(serving_config.watch_interval_seconds)
+    await batcher.start()
+    job_manager.resume()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    model_registry.stop()
+    await batcher.stop()
+    job_manager.shutdown(wait=False)
+    executor.shutdown(wait=False)
+
+
+@app.exception_handler(InferenceBusyError)
+async def inference_busy_handler(request: Request, exc: InferenceBusyError):
+    return JSONResponse({"error": str(exc)}, status_code=503, headers={"Retry-After": "1"})
+
+
+@app.exception_handler(ModelNotReadyError)
+async def model_not_ready_handler(request: Request, exc: ModelNotReadyError):
+    return JSONResponse({"error": str(exc)}, status_code=503, headers={"Retry-After": "5"})
+
+
+@app.exception_handler(UnknownModelError)
+async def unknown_model_handler(request: Request, exc: UnknownModelError):
+    return JSONResponse({"error": str(exc)}, status_code=404)
+
+
+@app.exception_handler(UnknownPolicyError)
+async def unknown_policy_handler(request: Request, exc: UnknownPolicyError):
+    return JSONResponse({"error": str(exc)}, status_code=400)
+
 
 # Serve a static directory if you want (optional)
 # app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -86,7 +262,7 @@ async def home():
 
           <div class="card p-3 footer">
             <div>Local demo • Model loaded from <code>artifacts/model</code></div>
-            <div class="mt-2">API: <code>POST /api/summarize</code> (JSON) • <code>POST /api/summarize_file</code> (multipart CSV)</div>
+            <div class="mt-2">API: <code>POST /api/summarize</code> (JSON) • <code>POST /api/summarize_stream</code> (SSE) • <code>POST /api/summarize_variants</code> (several lengths) • <code>POST /api/summarize_file</code> (multipart CSV) • <code>POST /api/jobs</code> (large CSV, background) • <code>GET /api/models</code> • <code>GET /api/decoding</code> • <code>GET /metrics</code></div>
           </div>
         </div>
       </div>
@@ -108,15 +284,32 @@ async def home():
         if (!text) return alert("Please enter some text first.");
         spinner.style.display = "inline-block";
         summarizeBtn.disabled = true;
+        summaryText.textContent = "";
         try {
-          const resp = await fetch("/api/summarize", {
+          // Render the summary progressively from the server-sent token stream
+          const resp = await fetch("/api/summarize_stream", {
             method: "POST",
             headers: { "Content-Type": "application/json" },
             body: JSON.stringify({ text })
           });
-          const data = await resp.json();
-          summaryText.textContent = data.summary;
+          if (!resp.ok) { const txt = await resp.text(); throw new Error(txt || "Request failed"); }
           resultCard.style.display = "block";
+          const reader = resp.body.getReader();
+          const decoder = new TextDecoder();
+          let buffer = "";
+          while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const events = buffer.split("\\n\\n");
+            buffer = events.pop();
+            for (const evt of events) {
+              if (!evt.startsWith("data: ")) continue;
+              const data = JSON.parse(evt.slice(6));
+              if (data.error) throw new Error(data.error);
+              if (data.token) summaryText.textContent += data.token;
+            }
+          }
         } catch (err) {
           alert("Error: " + (err.message || err));
         } finally {
@@ -157,9 +350,51 @@ async def home():
     )
 
 
+# ---------- Health: liveness and readiness probes ----------
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    status = model_loader.status()
+    return JSONResponse(status, status_code=200 if model_loader.is_ready() else 503)
+
+
+# ---------- Metrics (Prometheus text format) ----------
+@app.get("/metrics")
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
 # ---------- API: JSON summarize ----------
 class SummarizeRequest(BaseModel):
     text: str
+    long_document: bool = False
+    model: Optional[str] = None  # a name from serving.models; the default model when omitted
+    max_length: int = 128
+    min_length: int = 30
+    decoding: Optional[str] = None  # a name from decoding.policies; decoding.default_policy when omitted
+    deadline_ms: Optional[float] = None  # allow a cheaper policy when this latency is at risk
+
+
+def _resolve_decoding(text, policy_name, deadline_ms, streaming=False):
+    # The word count stands in for the token count: subword tokenizers emit
+    # at least one token per word, and counting words does not tokenize the
+    # whole input on the event loop
+    return decoding_policies.resolve(
+        policy_name,
+        deadline_ms=deadline_ms,
+        input_tokens=len(text.split()) if deadline_ms is not None else 0,
+        queue_depth=batcher.queue_depth,
+        max_batch_size=batcher.max_batch_size,
+        streaming=streaming
+    )
+
+
+def _decoding_report(policy, requested, reason):
+    return {**describe(policy), "requested": requested.name, "fallback_reason": reason}
 
 
 @app.post("/api/summarize")
@@ -167,43 +402,199 @@ async def api_summarize(req: SummarizeRequest):
     text = req.text.strip()
     if not text:
         return JSONResponse({"error": "Empty text"}, status_code=400)
-    summary = predictor.summarize(text)
-    return {"summary": summary}
+    model = req.model or model_registry.default_model
+    requested = decoding_policies.get(req.decoding)
+    predictor = await model_registry.aget(model)
+    policy, reason = _resolve_decoding(text, requested.name, req.deadline_ms)
+    if req.long_document:
+        # Chunked map-reduce instead of truncating at the model's input limit
+        summary = await executor.run(
+            predictor.summarize_long,
+            text,
+            chunk_tokens=long_doc_config.chunk_tokens,
+            overlap_tokens=long_doc_config.overlap_tokens,
+            max_rounds=long_doc_config.max_rounds,
+            batch_size=long_doc_config.batch_size,
+            max_length=req.max_length,
+            min_length=req.min_length,
+            **generate_kwargs(policy)
+        )
+    else:
+        # Only these requests feed the per-policy latency used for deadlines:
+        # long documents would skew it
+        summary = await batcher.summarize(text, max_length=req.max_length, min_length=req.min_length, model=model,
+                                          generate_kwargs=generate_kwargs(policy),
+                                          on_generated=_observe_policy[policy.name])
+    return {"summary": summary, "model": model, "decoding": _decoding_report(policy, requested, reason)}
+
+
+# ---------- API: several summary lengths from one encoder pass ----------
+class SummaryVariant(BaseModel):
+    max_length: int
+    min_length: int = 0
+
+
+class SummarizeVariantsRequest(BaseModel):
+    text: str
+    variants: List[SummaryVariant]
+    model: Optional[str] = None
+    decoding: Optional[str] = None
+
+
+@app.post("/api/summarize_variants")
+async def api_summarize_variants(req: SummarizeVariantsRequest):
+    text = req.text.strip()
+    if not text:
+        return JSONResponse({"error": "Empty text"}, status_code=400)
+    if not req.variants:
+        return JSONResponse({"error": "No variants requested"}, status_code=400)
+    model = req.model or model_registry.default_model
+    policy = decoding_policies.get(req.decoding)
+    predictor = await model_registry.aget(model)
+    variants = [(v.max_length, min(v.min_length, v.max_length)) for v in req.variants]
+    summaries = await executor.run(predictor.summarize_variants, text, variants, **generate_kwargs(policy))
+    return {
+        "summaries": [
+            {"max_length": max_length, "min_length": min_length, "summary": summary}
+            for (max_length, min_length), summary in zip(variants, summaries)
+        ],
+        "model": model,
+        "decoding": _decoding_report(policy, policy, None),
+    }
+
+
+# ---------- API: token streaming summarize (server-sent events) ----------
+def _sse(payload):
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+def _stream_events(pieces, first=None):
+    if first is not None:
+        yield _sse(first)
+    try:
+        for piece in pieces:
+            yield _sse({"token": piece})
+    except Exception as e:
+        yield _sse({"error": str(e)})
+        return
+    yield _sse({"done": True})
+
+
+@app.post("/api/summarize_stream")
+async def api_summarize_stream(req: SummarizeRequest):
+    text = req.text.strip()
+    if not text:
+        return JSONResponse({"error": "Empty text"}, status_code=400)
+    if req.long_document:
+        return JSONResponse({"error": "long_document is not supported for streaming, use /api/summarize"},
+                            status_code=400)
+    model = req.model or model_registry.default_model
+    requested = decoding_policies.get(req.decoding)
+    try:
+        policy, reason = _resolve_decoding(text, requested.name, req.deadline_ms, streaming=True)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    # Generation starts on the inference pool before the response is returned,
+    # so a full pool still answers 503
+    predictor = await model_registry.aget(model)
+    pieces = predictor.summarize_stream(text, max_length=req.max_length, min_length=req.min_length,
+                                        submit=executor.submit, **generate_kwargs(policy))
+    first = {"model": model, "decoding": _decoding_report(policy, requested, reason)}
+    return StreamingResponse(_stream_events(pieces, first), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+# ---------- API: model registry ----------
+@app.get("/api/models")
+async def api_models():
+    return await run_in_threadpool(model_registry.status)
+
+
+@app.post("/api/models/{name}/reload", status_code=202)
+async def api_reload_model(name: str):
+    # Loads the model's current files next to the running copy and swaps it in
+    # once ready; requests keep being served by the old copy until then
+    loader = model_registry.loader(name)
+    if not loader.is_ready():
+        return JSONResponse({"error": f"Model '{name}' is not loaded"}, status_code=409)
+    threading.Thread(target=model_registry.reload, args=(name,), name=f"reload-{name}", daemon=True).start()
+    return {"model": name, "status": "reloading"}
+
+
+# ---------- API: decoding policies ----------
+@app.get("/api/decoding")
+async def api_decoding():
+    return decoding_policies.status()
+
+
+# ---------- API: cache statistics ----------
+@app.get("/api/cache/stats")
+async def api_cache_stats():
+    stats = {"enabled": False} if summary_cache is None else {"enabled": True, **summary_cache.stats()}
+    stats["encoder"] = {"enabled": False} if encoder_cache is None else {"enabled": True, **encoder_cache.stats()}
+    return stats
 
 
 # ---------- API: CSV file upload and batch summarize ----------
 @app.post("/api/summarize_file")
 async def api_summarize_file(file: UploadFile = File(...)):
-    # Expect CSV with 'dialogue' column
-    content = await file.read()
-    try:
-        text_io = io.StringIO(content.decode("utf-8"))
-    except UnicodeDecodeError:
-        # try alternative encodings if necessary
-        text_io = io.StringIO(content.decode("latin-1"))
+    # Expect CSV with 'dialogue' column; the upload is read incrementally from
+    # its spooled file instead of being loaded into memory
+    encoding = detect_encoding(file.file)
+    text_io = io.TextIOWrapper(file.file, encoding=encoding, errors=DECODE_ERRORS, newline="")
 
     reader = csv.DictReader(text_io)
-    if "dialogue" not in reader.fieldnames:
+    if not reader.fieldnames or "dialogue" not in reader.fieldnames:
         return JSONResponse({"error": "CSV must contain 'dialogue' column"}, status_code=400)
+    await model_loader.aget()
+    if executor.is_saturated():
+        raise InferenceBusyError("Inference queue is full")
 
-    rows = list(reader)
-    # Summarize each dialogue
-    out_rows = []
-    for r in rows:
-        dialogue_text = r.get("dialogue", "") or ""
-        summary = predictor.summarize(dialogue_text)
-        out_r = dict(r)
-        out_r["summary"] = summary
-        out_rows.append(out_r)
-
-    # Create CSV output in-memory
-    out_io = io.StringIO()
-    fieldnames = list(out_rows[0].keys()) if out_rows else ["dialogue", "summary"]
-    writer = csv.DictWriter(out_io, fieldnames=fieldnames)
-    writer.writeheader()
-    writer.writerows(out_rows)
-    out_io.seek(0)
-
-    return StreamingResponse(io.BytesIO(out_io.getvalue().encode("utf-8")),
-                             media_type="text/csv",
-                             headers={"Content-Disposition": "attachment; filename=summaries.csv"})
+    headers = {"Content-Disposition": "attachment; filename=summaries.csv"}
+    summarize_chunk = _summarize_chunk
+    if dedup_config.enabled:
+        # A first pass over the upload clusters duplicate dialogues. The
+        # headers go out before any row is summarized, so they count clusters,
+        # not model calls: a unique row may still be answered from the
+        # summary cache.
+        plan = await run_in_threadpool(plan_csv_duplicates, text_io, dedup_config)
+        summarize_chunk = ClusterSummarizer(plan, _summarize_chunk)
+        reader = csv.DictReader(text_io)
+        headers.update({
+            "X-Rows": str(plan.rows),
+            "X-Unique-Rows": str(plan.unique),
+            "X-Duplicate-Rows": str(plan.rows - plan.unique),
+        })
+
+    # Rows are summarized in bounded chunks and streamed back as each finishes
+    return StreamingResponse(iter_summary_csv(reader, summarize_chunk, chunk_size=serving_config.csv_chunk_rows),
+                             media_type="text/csv", headers=headers)
+
+
+# ---------- API: background batch jobs ----------
+@app.post("/api/jobs", status_code=202)
+async def api_submit_job(file: UploadFile = File(...)):
+    try:
+        job_id = await run_in_threadpool(job_manager.submit, file.file, file.filename or "upload.csv")
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return job_manager.status(job_id)
+
+
+@app.get("/api/jobs/{job_id}")
+async def api_job_status(job_id: str):
+    try:
+        return job_manager.status(job_id)
+    except JobNotFoundError:
+        return JSONResponse({"error": "Unknown job"}, status_code=404)
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def api_job_result(job_id: str):
+    try:
+        status = job_manager.status(job_id)
+    except JobNotFoundError:
+        return JSONResponse({"error": "Unknown job"}, status_code=404)
+    if status["status"] != "completed":
+        return JSONResponse({"error": f"Job is {status['status']}", **status}, status_code=409)
+    return FileResponse(job_manager.result_path(job_id), media_type="text/csv", filename="summaries.csv")
@@ -0,0 +1,43 @@
+import argparse
+import json
+import sys
+
+from src.summarizer.components.benchmark import InferenceBenchmark, check_regressions
+from src.summarizer.config.configuration import ConfigurationManager
+from src.summarizer.logging import configure_logging, logger
+
+if __name__ == "__main__":
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Benchmark summarization latency and throughput")
+    parser.add_argument("--targets", nargs="+", help="direct and/or app (default: benchmark.targets)")
+    parser.add_argument("--concurrency", nargs="+", type=int, help="concurrency levels to run")
+    parser.add_argument("--requests", type=int, help="requests per concurrency level")
+    parser.add_argument("--corpus", help="corpus file (.jsonl, .csv or text)")
+    parser.add_argument("--output", help="results file (default: a new file in benchmark.output_dir)")
+    parser.add_argument("--compare", help="baseline results file; exit 1 if any metric regressed")
+    args = parser.parse_args()
+
+    config = ConfigurationManager().get_benchmark_config()
+    if args.requests:
+        config.num_requests = args.requests
+    if args.corpus:
+        config.corpus_path = args.corpus
+
+    # -------------------- Run and record --------------------
+    benchmark = InferenceBenchmark(config)
+    report = benchmark.run(targets=args.targets, concurrency_levels=args.concurrency)
+    benchmark.save(report, args.output)
+
+    # -------------------- Regression check --------------------
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = check_regressions(baseline, report, config.regression_threshold)
+        for r in regressions:
+            logger.warning(
+                f"Regression [{r['target']} x{r['concurrency']}] {r['metric']}: "
+                f"{r['baseline']} -> {r['current']} ({r['change']:+.1%})"
+            )
+        if regressions:
+            sys.exit(1)
+        logger.info(f"No regressions against {args.compare} (threshold {config.regression_threshold:.0%})")
@@ -0,0 +1,16 @@
+from src.summarizer.logging import configure_logging, logger
+from src.summarizer.pipeline.stage_5_model_export_pipeline import ModelExportPipeline
+
+if __name__ == "__main__":
+    configure_logging()
+
+    # -------------------- Export trained model for ONNX Runtime --------------------
+    STAGE_NAME = "Model Export Stage"
+    try:
+        logger.info(f">>>>>> Stage: {STAGE_NAME} started <<<<<<")
+        export_pipeline = ModelExportPipeline()
+        export_pipeline.initiate_model_export()
+        logger.info(f">>>>>> Stage: {STAGE_NAME} completed <<<<<<\n\nx==========x")
+    except Exception as e:
+        logger.exception(f"Error in {STAGE_NAME}: {e}")
+        raise e
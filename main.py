@@ -1,58 +1,86 @@
+import argparse
+import os
 
-from src.summarizer.logging import logger
+from src.summarizer.components.data_transformation import DataTransformation
+from src.summarizer.config.configuration import ConfigurationManager
+from src.summarizer.logging import configure_logging
 from src.summarizer.pipeline.stage_1_data_ingestion_pipeline import DataIngestionTrainingPipeline
 from src.summarizer.pipeline.stage_2_data_transformation_pipeline import DataTransformationTrainingPipeline
+from src.summarizer.pipeline.stage_2b_data_tokenization_pipeline import DataTokenizationTrainingPipeline
 from src.summarizer.pipeline.stage_3_model_trainer_pipeline import ModelTrainerTrainingPipeline
+from src.summarizer.pipeline.stage_runner import Stage, StageRunner
 
-if __name__ == "__main__":
 
-    # -------------------- Stage 1: Data Ingestion --------------------
-    STAGE_NAME = "Data Ingestion Stage"
-    try:
-        logger.info(f">>>>>> Stage: {STAGE_NAME} started <<<<<<")
-        data_ingestion_pipeline = DataIngestionTrainingPipeline()
-        data_ingestion_pipeline.initiate_data_ingestion()
-        logger.info(f">>>>>> Stage: {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(f"Error in {STAGE_NAME}: {e}")
-        raise e
-
-    # -------------------- Stage 2: Data Transformation --------------------
-    STAGE_NAME = "Data Transformation Stage"
-    try:
-        logger.info(f">>>>>> Stage: {STAGE_NAME} started <<<<<<")
-        data_transformation_pipeline = DataTransformationTrainingPipeline()
-        data_transformation_pipeline.initiate_data_transformation()
-        logger.info(f">>>>>> Stage: {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(f"Error in {STAGE_NAME}: {e}")
-        raise e
-
-    # -------------------- Stage 3: Model Training --------------------
-    STAGE_NAME = "Model Trainer Stage"
-    try:
-        logger.info(f">>>>>> Stage: {STAGE_NAME} started <<<<<<")
-        model_trainer_pipeline = ModelTrainerTrainingPipeline()
-        model_trainer_pipeline.initiate_model_trainer()
-        logger.info(f">>>>>> Stage: {STAGE_NAME} completed <<<<<<\n\nx==========x")
-    except Exception as e:
-        logger.exception(f"Error in {STAGE_NAME}: {e}")
-        raise e
-    
-    # -------------------- Stage 4: Model Evaluation --------------------
-    
-      # -------------------- Stage 4: Model Evaluation --------------------STAGE_NAME = "Model Evaluation Stage"
-STAGE_NAME = "Model Evaluation Stage"
-try:
-    logger.info(f">>>>>> Stage: {STAGE_NAME} started <<<<<<")
+def run_evaluation():
     from src.summarizer.pipeline.stage_4_model_evaluation import ModelEvaluationTrainingPipeline
 
     evaluation_pipeline = ModelEvaluationTrainingPipeline()
-    evaluation_pipeline.initiate_model_evaluation(
-        eval_path="artifacts/data_transformation/val.csv"
-    )
-
-    logger.info(f">>>>>> Stage: {STAGE_NAME} completed <<<<<<\n\nx==========x")
-except Exception as e:
-    logger.exception(f"Error in {STAGE_NAME}: {e}")
-    raise e
+    evaluation_pipeline.initiate_model_evaluation()
+
+
+def build_stages(config_manager):
+    ingestion = config_manager.get_data_ingestion_config()
+    transformation = config_manager.get_data_transformation_config()
+    tokenization = config_manager.get_data_tokenization_config()
+    trainer = config_manager.get_model_trainer_config()
+    evaluation = config_manager.get_model_evaluation_config()
+
+    raw_splits = [transformation.train_path, transformation.test_path, transformation.val_path]
+    # Later stages read the cleaned splits, not the raw ingestion CSVs
+    transformed = DataTransformation(transformation)
+
+    return [
+        # -------------------- Stage 1: Data Ingestion --------------------
+        Stage(
+            name="data_ingestion",
+            run=DataIngestionTrainingPipeline().initiate_data_ingestion,
+            config_sections=["data_ingestion"],
+            outputs=[ingestion.local_data_file, *raw_splits],
+        ),
+        # -------------------- Stage 2: Data Transformation --------------------
+        Stage(
+            name="data_transformation",
+            run=DataTransformationTrainingPipeline().initiate_data_transformation,
+            config_sections=["data_transformation"],
+            inputs=raw_splits,
+            outputs=[path for split in ("train", "test", "val") for path in transformed.output_paths(split)],
+        ),
+        # -------------------- Stage 2b: Data Tokenization --------------------
+        Stage(
+            name="data_tokenization",
+            run=DataTokenizationTrainingPipeline().initiate_data_tokenization,
+            config_sections=["data_tokenization", "training", "evaluation"],
+            inputs=[transformed.split_path("train"), transformed.split_path("test"), evaluation.data_path],
+            outputs=[tokenization.root_dir],
+        ),
+        # -------------------- Stage 3: Model Training --------------------
+        Stage(
+            name="model_trainer",
+            run=ModelTrainerTrainingPipeline().initiate_model_trainer,
+            config_sections=["training", "data_tokenization"],
+            use_params=True,
+            inputs=[transformed.split_path("train"), transformed.split_path("test")],
+            outputs=[trainer.output_dir],
+        ),
+        # -------------------- Stage 4: Model Evaluation --------------------
+        Stage(
+            name="model_evaluation",
+            run=run_evaluation,
+            config_sections=["evaluation", "data_tokenization", "decoding"],
+            inputs=[evaluation.model_path, evaluation.data_path],
+            outputs=[os.path.join(evaluation.root_dir, "metrics.json")],
+        ),
+    ]
+
+
+if __name__ == "__main__":
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Run the training pipeline, skipping stages that are up to date")
+    parser.add_argument("--force", nargs="*", default=[], metavar="STAGE",
+                        help="stage names to re-run regardless of the manifest, or 'all'")
+    args = parser.parse_args()
+
+    config_manager = ConfigurationManager()
+    pipeline_config = config_manager.get_pipeline_config()
+    runner = StageRunner(pipeline_config.manifest_path, config_manager.config, config_manager.params)
+    runner.run_all(build_stages(config_manager), force=args.force)
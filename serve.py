@@ -0,0 +1,36 @@
+import argparse
+
+from src.summarizer.components.prefork_server import PreforkServer
+from src.summarizer.config.configuration import ConfigurationManager
+from src.summarizer.logging import configure_logging
+
+if __name__ == "__main__":
+    configure_logging()
+    parser = argparse.ArgumentParser(description="Serve the summarization API")
+    parser.add_argument("--host", help="bind address (default: serving.host)")
+    parser.add_argument("--port", type=int, help="bind port (default: serving.port)")
+    parser.add_argument("--workers", type=int, help="server processes; 0 = one per available core")
+    parser.add_argument("--threads-per-worker", type=int, help="torch intra-op threads; 0 = split the cores")
+    args = parser.parse_args()
+
+    config = ConfigurationManager().get_serving_config()
+    workers = config.workers if args.workers is None else args.workers
+    threads = config.threads_per_worker if args.threads_per_worker is None else args.threads_per_worker
+
+    # The server imports the app once the torch thread limits are set; with
+    # several workers the default model is loaded once, before the processes
+    # are forked
+    server = PreforkServer(
+        "app",
+        host=args.host or config.host,
+        port=args.port or config.port,
+        workers=workers,
+        threads_per_worker=threads,
+        inference_workers=config.inference_workers,
+        pin_cpus=config.pin_cpus,
+        watch_interval_seconds=config.watch_interval_seconds
+    )
+    if server.workers > 1:
+        server.run()
+    else:
+        server.run_single()
@@ -0,0 +1,214 @@
+# src/summarizer/components/batch_jobs.py
+import csv
+import fcntl
+import itertools
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from src.summarizer.components.csv_batch import DECODE_ERRORS, detect_encoding, iter_row_chunks, plan_csv_duplicates
+from src.summarizer.components.near_dedup import ClusterSummarizer
+from src.summarizer.logging import logger
+
+
+class JobNotFoundError(Exception):
+    pass
+
+
+# Background CSV summarization jobs. Each job lives in its own directory under
+# jobs_dir (input.csv, output.csv, status.json); output is checkpointed after
+# every chunk so a restarted server resumes where it stopped. With dedup
+# enabled, duplicate and near-duplicate dialogues are summarized once.
+class BatchJobManager:
+    def __init__(self, summarize_chunk, jobs_dir="artifacts/jobs", max_workers=1, chunk_rows=256,
+                 dedup_config=None):
+        self.summarize_chunk = summarize_chunk
+        self.dedup_config = dedup_config
+        self.jobs_dir = jobs_dir
+        self.chunk_rows = max(int(chunk_rows), 1)
+        self._pool = ThreadPoolExecutor(max_workers=max(int(max_workers), 1), thread_name_prefix="batch-job")
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        os.makedirs(self.jobs_dir, exist_ok=True)
+
+    # ---------- paths and status ----------
+    def _job_dir(self, job_id):
+        # Job ids are generated hex strings; refuse anything that could escape jobs_dir
+        if not job_id or not job_id.isalnum():
+            raise JobNotFoundError(job_id)
+        return os.path.join(self.jobs_dir, job_id)
+
+    def _read_status(self, job_id):
+        path = os.path.join(self._job_dir(job_id), "status.json")
+        if not os.path.exists(path):
+            raise JobNotFoundError(job_id)
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_status(self, job_id, status):
+        path = os.path.join(self._job_dir(job_id), "status.json")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(status, f)
+        os.replace(tmp_path, path)
+
+    def _update_status(self, job_id, **changes):
+        with self._lock:
+            status = self._read_status(job_id)
+            status.update(changes)
+            self._write_status(job_id, status)
+            return status
+
+    # ---------- public API ----------
+    def submit(self, source_file, filename="upload.csv"):
+        job_id = uuid.uuid4().hex
+        job_dir = self._job_dir(job_id)
+        os.makedirs(job_dir)
+        input_path = os.path.join(job_dir, "input.csv")
+        with open(input_path, "wb") as f:
+            shutil.copyfileobj(source_file, f)
+
+        with open(input_path, "rb") as f:
+            encoding = detect_encoding(f)
+        with open(input_path, encoding=encoding, errors=DECODE_ERRORS, newline="") as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames or "dialogue" not in reader.fieldnames:
+                shutil.rmtree(job_dir, ignore_errors=True)
+                raise ValueError("CSV must contain 'dialogue' column")
+            rows_total = sum(1 for _ in reader)
+
+        self._write_status(job_id, {
+            "job_id": job_id,
+            "filename": filename,
+            "encoding": encoding,
+            "status": "queued",
+            "rows_total": rows_total,
+            "rows_done": 0,
+            "output_bytes": 0,
+            "processing_seconds": 0.0,
+            "generations": 0,
+            "generations_saved": 0,
+            "created_at": time.time(),
+            "finished_at": None,
+            "error": None,
+        })
+        self._pool.submit(self._run, job_id)
+        logger.info(f"Batch job {job_id} queued ({rows_total} rows from {filename})")
+        return job_id
+
+    def status(self, job_id):
+        status = self._read_status(job_id)
+        total = status["rows_total"]
+        seconds = status["processing_seconds"]
+        status["progress"] = status["rows_done"] / total if total else 1.0
+        status["rows_per_second"] = status["rows_done"] / seconds if seconds else 0.0
+        return status
+
+    def result_path(self, job_id):
+        self._read_status(job_id)
+        return os.path.join(self._job_dir(job_id), "output.csv")
+
+    def resume(self):
+        # Re-queue jobs that were queued or mid-run when the server stopped
+        resumed = []
+        for job_id in sorted(os.listdir(self.jobs_dir)):
+            try:
+                status = self._read_status(job_id)
+            except (JobNotFoundError, ValueError):
+                continue
+            if status["status"] in ("queued", "running"):
+                self._pool.submit(self._run, job_id)
+                resumed.append(job_id)
+        if resumed:
+            logger.info(f"Resuming {len(resumed)} batch job(s): {', '.join(resumed)}")
+        return resumed
+
+    def shutdown(self, wait=False):
+        # Running jobs stop at their next checkpoint and stay "running" on disk,
+        # so resume() picks them up on the next start
+        self._stopping.set()
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    # ---------- worker ----------
+    def _run(self, job_id):
+        # Several server processes may resume the same jobs; an exclusive lock
+        # on the job directory makes sure only one of them works on each
+        lock_file = open(os.path.join(self._job_dir(job_id), ".lock"), "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return
+        try:
+            if self._read_status(job_id)["status"] in ("queued", "running"):
+                self._process(job_id)
+        except Exception as e:
+            logger.exception(f"Batch job {job_id} failed: {e}")
+            self._update_status(job_id, status="failed", error=str(e), finished_at=time.time())
+        finally:
+            lock_file.close()
+
+    def _process(self, job_id):
+        status = self._update_status(job_id, status="running")
+        job_dir = self._job_dir(job_id)
+        input_path = os.path.join(job_dir, "input.csv")
+        output_path = os.path.join(job_dir, "output.csv")
+        rows_done = status["rows_done"]
+        processing_seconds = status["processing_seconds"]
+
+        # Drop anything written after the last checkpoint (e.g. a chunk cut off
+        # by a crash) before appending again
+        if os.path.exists(output_path):
+            with open(output_path, "r+b") as f:
+                f.truncate(status["output_bytes"])
+        if rows_done:
+            logger.info(f"Batch job {job_id} resuming at row {rows_done}/{status['rows_total']}")
+
+        with open(input_path, encoding=status["encoding"], errors=DECODE_ERRORS, newline="") as src, \
+                open(output_path, "a", encoding="utf-8", newline="") as out:
+            dedup = None
+            if self.dedup_config is not None and self.dedup_config.enabled:
+                # Recomputed on resume: clustering is deterministic for the same input
+                plan = plan_csv_duplicates(src, self.dedup_config)
+                dedup = ClusterSummarizer(plan, self.summarize_chunk, start_row=rows_done)
+                status = self._update_status(job_id, rows_unique=plan.unique, dedup=plan.stats())
+            previous_generations = generations = status.get("generations", 0)
+
+            reader = csv.DictReader(src)
+            fieldnames = list(reader.fieldnames)
+            if "summary" not in fieldnames:
+                fieldnames.append("summary")
+            writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction="ignore")
+            if status["output_bytes"] == 0:
+                writer.writeheader()
+
+            for rows in iter_row_chunks(itertools.islice(reader, rows_done, None), self.chunk_rows):
+                if self._stopping.is_set():
+                    logger.info(f"Batch job {job_id} paused at row {rows_done}/{status['rows_total']}")
+                    return
+                started = time.perf_counter()
+                dialogues = [r.get("dialogue", "") or "" for r in rows]
+                if dedup is not None:
+                    summaries = dedup(dialogues)
+                    generations = previous_generations + dedup.generations
+                else:
+                    summaries = self.summarize_chunk(dialogues)
+                    generations += len(rows)
+                for r, summary in zip(rows, summaries):
+                    r["summary"] = summary
+                    writer.writerow(r)
+                out.flush()
+                os.fsync(out.fileno())
+
+                rows_done += len(rows)
+                processing_seconds += time.perf_counter() - started
+                self._update_status(job_id, rows_done=rows_done, output_bytes=out.tell(),
+                                    processing_seconds=processing_seconds, generations=generations,
+                                    generations_saved=rows_done - generations)
+
+        self._update_status(job_id, status="completed", finished_at=time.time())
+        logger.info(f"Batch job {job_id} completed ({rows_done} rows, {generations} generations)")
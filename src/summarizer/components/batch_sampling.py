@@ -0,0 +1,56 @@
+# src/summarizer/components/batch_sampling.py
+import torch
+from torch.utils.data import Sampler
+
+
+# Yields batches of dataset indices whose padded size (batch length x longest
+# member) stays under max_tokens. Examples are shuffled, then sorted by length
+# inside large windows so each batch holds similar lengths while the order
+# stays random. The batches are built once and only their order is reshuffled
+# every epoch: the Trainer sizes max_steps and the LR schedule from len(), so
+# every epoch has to yield exactly that many batches.
+class TokenBudgetBatchSampler(Sampler):
+    def __init__(self, lengths, max_tokens, shuffle=True, seed=42, window_size=1000):
+        self.lengths = list(lengths)
+        self.max_tokens = max(int(max_tokens), 1)
+        self.shuffle = shuffle
+        self.seed = seed
+        self.window_size = max(int(window_size), 1)
+        self.epoch = 0
+        self._batches = self._build_batches()
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def _build_batches(self):
+        generator = torch.Generator()
+        generator.manual_seed(self.seed)
+        n = len(self.lengths)
+        order = torch.randperm(n, generator=generator).tolist() if self.shuffle else list(range(n))
+
+        batches = []
+        for start in range(0, n, self.window_size):
+            window = sorted(order[start:start + self.window_size], key=lambda i: self.lengths[i])
+            batch, longest = [], 0
+            for i in window:
+                candidate = max(longest, self.lengths[i])
+                if batch and candidate * (len(batch) + 1) > self.max_tokens:
+                    batches.append(batch)
+                    batch, candidate = [], self.lengths[i]
+                batch.append(i)
+                longest = candidate
+            if batch:
+                batches.append(batch)
+        return batches
+
+    def __iter__(self):
+        batches = self._batches
+        if self.shuffle:
+            generator = torch.Generator()
+            generator.manual_seed(self.seed + self.epoch)
+            batches = [batches[i] for i in torch.randperm(len(batches), generator=generator).tolist()]
+        self.epoch += 1
+        yield from batches
+
+    def __len__(self):
+        return len(self._batches)
@@ -0,0 +1,301 @@
+# src/summarizer/components/benchmark.py
+import asyncio
+import csv
+import json
+import os
+import platform
+import resource
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.summarizer.logging import logger
+
+TARGETS = ("direct", "app")
+
+# Metrics compared by check_regressions: name -> True when higher is better
+COMPARED_METRICS = {"p50_ms": False, "p95_ms": False, "p99_ms": False, "requests_per_second": True,
+                    "output_tokens_per_second": True}
+
+
+def load_corpus(path, limit=None):
+    # .jsonl (text / dialogue field, or title + body as in requests.jsonl),
+    # .csv with a dialogue column, or plain text with blank-line separated entries
+    texts = []
+    if path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                text = record.get("text") or record.get("dialogue") or \
+                    "\n".join(str(record[k]) for k in ("title", "body") if record.get(k))
+                if text:
+                    texts.append(text)
+    elif path.endswith(".csv"):
+        with open(path, encoding="utf-8", newline="") as f:
+            texts = [row["dialogue"] for row in csv.DictReader(f) if row.get("dialogue")]
+    else:
+        with open(path, encoding="utf-8") as f:
+            texts = [chunk.strip() for chunk in f.read().split("\n\n") if chunk.strip()]
+    if not texts:
+        raise ValueError(f"No benchmark inputs found in {path}")
+    return texts[:limit] if limit else texts
+
+
+def percentile(values, q):
+    # Linear interpolation between closest ranks, as numpy.percentile does
+    if not values:
+        return None
+    values = sorted(values)
+    rank = (len(values) - 1) * q / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def reset_peak_rss():
+    # Linux lets a process reset its own high-water mark, which makes the
+    # peak per concurrency level instead of per process; elsewhere it is the
+    # process-lifetime peak
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def summarize_level(target, concurrency, latencies, errors, wall_seconds, input_tokens, output_tokens):
+    completed = len(latencies)
+    return {
+        "target": target,
+        "concurrency": concurrency,
+        "requests": completed + errors,
+        "errors": errors,
+        "wall_seconds": round(wall_seconds, 3),
+        "p50_ms": _ms(percentile(latencies, 50)),
+        "p95_ms": _ms(percentile(latencies, 95)),
+        "p99_ms": _ms(percentile(latencies, 99)),
+        "mean_ms": _ms(sum(latencies) / completed if completed else None),
+        "requests_per_second": round(completed / wall_seconds, 3) if wall_seconds else 0.0,
+        "input_tokens_per_second": round(input_tokens / wall_seconds, 1) if wall_seconds else 0.0,
+        "output_tokens_per_second": round(output_tokens / wall_seconds, 1) if wall_seconds else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def check_regressions(baseline, current, threshold=0.10):
+    # Compares runs level by level; a metric regresses when it is worse than
+    # the baseline by more than `threshold` (a fraction)
+    base_levels = {(r["target"], r["concurrency"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = base_levels.get((result["target"], result["concurrency"]))
+        if base is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = base.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (change < -threshold) if higher_is_better else (change > threshold):
+                regressions.append({
+                    "target": result["target"],
+                    "concurrency": result["concurrency"],
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change": round(change, 4),
+                })
+    return regressions
+
+
+# Replays a corpus against ModelPrediction directly ("direct": a thread pool
+# of callers, no batching) and against the FastAPI app in-process ("app":
+# concurrent POST /api/summarize through an ASGI transport, so requests go
+# through the micro-batcher and executor exactly as in serving). Summary
+# caching is off in both, otherwise repeated inputs would measure the cache.
+class InferenceBenchmark:
+    def __init__(self, config):
+        self.config = config
+        self.texts = load_corpus(config.corpus_path)
+        self._tokenizer = None
+
+    def _inputs(self):
+        # Cycle the corpus up to num_requests, so small corpora still give
+        # stable percentiles
+        return [self.texts[i % len(self.texts)] for i in range(self.config.num_requests)]
+
+    def _count_tokens(self, texts):
+        return sum(len(ids) for ids in self._tokenizer(list(texts), add_special_tokens=False)["input_ids"])
+
+    # ---------- direct ----------
+    def run_direct(self, concurrency_levels):
+        from src.summarizer.components.model_prediction import ModelPrediction
+
+        predictor = ModelPrediction(model_path=self.config.model_path, cache=None, backend=self.config.backend,
+                                    onnx_dir=self.config.onnx_dir)
+        self._tokenizer = predictor.tokenizer
+        for text in self.texts[:self.config.warmup_requests]:
+            predictor.summarize(text)
+
+        results = []
+        for concurrency in concurrency_levels:
+            inputs = self._inputs()
+            latencies, summaries = [], []
+
+            def call(text):
+                started = time.perf_counter()
+                summary = predictor.summarize(text)
+                return time.perf_counter() - started, summary
+
+            reset_peak_rss()
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                for latency, summary in pool.map(call, inputs):
+                    latencies.append(latency)
+                    summaries.append(summary)
+            wall = time.perf_counter() - started
+            results.append(self._report("direct", concurrency, latencies, 0, wall, inputs, summaries))
+        return results
+
+    # ---------- app (in-process) ----------
+    def run_app(self, concurrency_levels):
+        return asyncio.run(self._run_app(concurrency_levels))
+
+    async def _run_app(self, concurrency_levels):
+        import logging
+        import httpx
+        import app as app_module
+
+        # One INFO line per request would drown the results
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        # Only the parts of the app's startup that serve /api/summarize: the
+        # full startup hook would also resume pending batch jobs and watch for
+        # model swaps in the middle of the run
+        app_module.model_registry.start()
+        await app_module.batcher.start()
+        try:
+            predictor = await asyncio.to_thread(app_module.model_loader.get, True)
+            # The inputs repeat, so both caches would turn every request after
+            # the first round into a hit. Turned off on this predictor only;
+            # the app's caches (and their /metrics) stay as they are.
+            predictor.cache = predictor.encoder_cache = None
+            self._tokenizer = predictor.tokenizer
+            transport = httpx.ASGITransport(app=app_module.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark",
+                                         timeout=None) as client:
+                for text in self.texts[:self.config.warmup_requests]:
+                    await client.post("/api/summarize", json={"text": text})
+
+                results = []
+                for concurrency in concurrency_levels:
+                    results.append(await self._run_app_level(client, concurrency))
+                return results
+        finally:
+            await app_module.batcher.stop()
+            app_module.model_registry.stop()
+
+    async def _run_app_level(self, client, concurrency):
+        inputs = self._inputs()
+        latencies, summaries = [], []
+        errors = 0
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(text):
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/api/summarize", json={"text": text})
+                latency = time.perf_counter() - started
+            if response.status_code == 200:
+                latencies.append(latency)
+                summaries.append((text, response.json()["summary"]))
+            else:
+                errors += 1
+
+        reset_peak_rss()
+        started = time.perf_counter()
+        await asyncio.gather(*(call(text) for text in inputs))
+        wall = time.perf_counter() - started
+        done_inputs = [text for text, _ in summaries]
+        return self._report("app", concurrency, latencies, errors, wall, done_inputs,
+                            [summary for _, summary in summaries])
+
+    # ---------- reporting ----------
+    def _report(self, target, concurrency, latencies, errors, wall, inputs, summaries):
+        result = summarize_level(target, concurrency, latencies, errors, wall,
+                                 self._count_tokens(inputs), self._count_tokens(summaries))
+        logger.info(
+            f"[{target} x{concurrency}] p50 {result['p50_ms']}ms p95 {result['p95_ms']}ms "
+            f"p99 {result['p99_ms']}ms | {result['requests_per_second']} req/s, "
+            f"{result['output_tokens_per_second']} out tok/s | errors {errors} | "
+            f"peak RSS {result['peak_rss_mb']} MB"
+        )
+        return result
+
+    def run(self, targets=None, concurrency_levels=None):
+        targets = targets or self.config.targets
+        concurrency_levels = concurrency_levels or self.config.concurrency_levels
+        unknown = set(targets) - set(TARGETS)
+        if unknown:
+            raise ValueError(f"Unknown benchmark targets {sorted(unknown)}, expected some of {TARGETS}")
+
+        results = []
+        if "direct" in targets:
+            results.extend(self.run_direct(concurrency_levels))
+        if "app" in targets:
+            results.extend(self.run_app(concurrency_levels))
+
+        import torch
+        return {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "corpus": self.config.corpus_path,
+            "num_requests": self.config.num_requests,
+            "model_path": self.config.model_path,
+            "backend": self.config.backend,
+            "environment": {
+                "python": platform.python_version(),
+                "torch": torch.__version__,
+                "cpu_count": os.cpu_count(),
+                "torch_threads": torch.get_num_threads(),
+                "platform": platform.platform(),
+            },
+            "results": results,
+        }
+
+    def save(self, report, path=None):
+        if path is None:
+            os.makedirs(self.config.output_dir, exist_ok=True)
+            name = f"{report['timestamp'].replace(':', '')}-{report['commit'] or 'nogit'}.json"
+            path = os.path.join(self.config.output_dir, name)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        logger.info(f"Benchmark results written to {path}")
+        return path
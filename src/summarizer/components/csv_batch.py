@@ -0,0 +1,78 @@
+# src/summarizer/components/csv_batch.py
+import codecs
+import csv
+import io
+
+from src.summarizer.components.near_dedup import plan_clusters
+
+
+# Only the head of a file is sniffed, so a utf-8 upload can still hold a bad
+# byte further down; it is decoded as U+FFFD instead of failing a response
+# that has already started streaming
+DECODE_ERRORS = "replace"
+
+
+def detect_encoding(binary_file, sample_size=64 * 1024):
+    # Peek at the head of the upload: utf-8 if it decodes cleanly, latin-1 otherwise
+    position = binary_file.tell()
+    sample = binary_file.read(sample_size)
+    binary_file.seek(position)
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def plan_csv_duplicates(text_file, dedup_config):
+    # Clusters the 'dialogue' column in one pass over the file, then rewinds
+    # it for the summarizing pass
+    text_file.seek(0)
+    reader = csv.DictReader(text_file)
+    plan = plan_clusters(
+        (row.get("dialogue", "") or "" for row in reader),
+        threshold=dedup_config.similarity_threshold,
+        num_perm=dedup_config.num_perm,
+        bands=dedup_config.bands,
+        shingle_size=dedup_config.shingle_size
+    )
+    text_file.seek(0)
+    return plan
+
+
+def iter_row_chunks(reader, chunk_size):
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_summary_csv(reader, summarize_chunk, chunk_size=64):
+    # Yields the output CSV piece by piece: the header first, then the rows of
+    # each chunk as soon as its summaries are ready
+    fieldnames = list(reader.fieldnames)
+    if "summary" not in fieldnames:
+        fieldnames.append("summary")
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data.encode("utf-8")
+
+    writer.writeheader()
+    yield flush()
+
+    for rows in iter_row_chunks(reader, chunk_size):
+        summaries = summarize_chunk([r.get("dialogue", "") or "" for r in rows])
+        for r, summary in zip(rows, summaries):
+            r["summary"] = summary
+            writer.writerow(r)
+        yield flush()
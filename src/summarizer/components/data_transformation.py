@@ -1,26 +1,128 @@
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
-from sklearn.model_selection import train_test_split
 from src.summarizer.logging import logger
 
+TEXT_COLUMNS = ["dialogue", "summary"]
+_INLINE_SPACE = re.compile(r"[ \t\f\v\u00a0]+")
+
+
+def clean_text(series, normalize_whitespace=True):
+    series = series.fillna("").astype(str)
+    if normalize_whitespace:
+        # Unify line endings and collapse runs of inline whitespace, keeping
+        # the line breaks that separate dialogue turns
+        series = series.str.replace("\r\n", "\n", regex=False).str.replace("\r", "\n", regex=False)
+        series = series.str.replace(_INLINE_SPACE, " ", regex=True)
+    return series.str.strip()
+
+
+def read_split(path):
+    # Transformed splits are CSV or Parquet, depending on output_formats
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
 class DataTransformation:
     def __init__(self, config):
         self.config = config
 
-    def split_data(self):
-        logger.info(f"Reading training data from: {self.config.train_path}")
-        train_df = pd.read_csv(self.config.train_path)
+    def output_paths(self, split):
+        return [os.path.join(self.config.root_dir, f"{split}.{fmt}") for fmt in self.config.output_formats]
 
-        logger.info(f"Reading test data from: {self.config.test_path}")
-        test_df = pd.read_csv(self.config.test_path)
+    def split_path(self, split):
+        # The copy later stages read: the first of the configured formats
+        return self.output_paths(split)[0]
 
-        logger.info(f"Reading validation data from: {self.config.val_path}")
-        val_df = pd.read_csv(self.config.val_path)
+    def _clean_chunk(self, chunk, seen, stats):
+        for column in TEXT_COLUMNS:
+            if column in chunk.columns:
+                chunk[column] = clean_text(chunk[column], self.config.normalize_whitespace)
+        stats["rows_in"] += len(chunk)
 
-        logger.info(f"Train shape: {train_df.shape}, Test shape: {test_df.shape}, Val shape: {val_df.shape}")
+        empty = chunk["dialogue"] == ""
+        stats["empty"] += int(empty.sum())
+        chunk = chunk[~empty]
 
-        # Save to artifacts/data_transformation
-        train_df.to_csv(self.config.root_dir + "/train.csv", index=False)
-        test_df.to_csv(self.config.root_dir + "/test.csv", index=False)
-        val_df.to_csv(self.config.root_dir + "/val.csv", index=False)
+        if self.config.drop_duplicates:
+            # Only a 16-byte digest per unique row is kept across chunks, so
+            # memory grows with distinct rows, not with the text itself
+            keys = [
+                hashlib.blake2b(f"{d}\x00{s}".encode("utf-8"), digest_size=16).digest()
+                for d, s in zip(chunk["dialogue"], chunk.get("summary", [""] * len(chunk)))
+            ]
+            keep = []
+            for key in keys:
+                keep.append(key not in seen)
+                seen.add(key)
+            stats["duplicates"] += keep.count(False)
+            chunk = chunk.loc[keep]
+
+        stats["rows_out"] += len(chunk)
+        return chunk
+
+    def transform_split(self, split, source_path):
+        # One bounded chunk in memory at a time: read, clean, dedup, append to
+        # every output format. Outputs are written to .tmp and renamed at the
+        # end so a failed run never leaves a truncated split behind.
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        stats = {"split": split, "rows_in": 0, "rows_out": 0, "empty": 0, "duplicates": 0}
+        seen = set()
+        csv_path = os.path.join(self.config.root_dir, f"{split}.csv")
+        parquet_path = os.path.join(self.config.root_dir, f"{split}.parquet")
+        write_csv = "csv" in self.config.output_formats
+        write_parquet = "parquet" in self.config.output_formats
+        parquet_writer = None
+
+        logger.info(f"Transforming {split} split from: {source_path}")
+        columns = list(pd.read_csv(source_path, nrows=0).columns)
+        if write_csv:
+            pd.DataFrame(columns=columns).to_csv(csv_path + ".tmp", index=False)
+        if write_parquet:
+            # Every column is read as text, so the schema is fixed up front
+            schema = pa.schema([(column, pa.string()) for column in columns])
+            parquet_writer = pq.ParquetWriter(parquet_path + ".tmp", schema, compression="zstd")
+        try:
+            reader = pd.read_csv(source_path, chunksize=self.config.chunk_size, dtype=str,
+                                 keep_default_na=False)
+            for chunk in reader:
+                chunk = self._clean_chunk(chunk, seen, stats)
+                if write_csv:
+                    chunk.to_csv(csv_path + ".tmp", mode="a", header=False, index=False)
+                if write_parquet:
+                    parquet_writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+
+        if write_csv:
+            os.replace(csv_path + ".tmp", csv_path)
+        if write_parquet:
+            os.replace(parquet_path + ".tmp", parquet_path)
+        logger.info(
+            f"{split}: {stats['rows_in']} rows in, {stats['rows_out']} out "
+            f"({stats['duplicates']} duplicates, {stats['empty']} empty dialogues dropped)"
+        )
+        return stats
+
+    def split_data(self):
+        os.makedirs(self.config.root_dir, exist_ok=True)
+        splits = {
+            "train": self.config.train_path,
+            "test": self.config.test_path,
+            "val": self.config.val_path,
+        }
+        num_workers = max(1, min(self.config.num_workers or len(splits), len(splits)))
+        with ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="transform") as pool:
+            futures = [pool.submit(self.transform_split, split, path) for split, path in splits.items()]
+            results = [future.result() for future in futures]
 
-        logger.info("Data Transformation completed. Train, Test, Val saved.")
+        logger.info(f"Data Transformation completed. {', '.join(self.config.output_formats)} written "
+                    f"for {', '.join(splits)}.")
+        return results
@@ -0,0 +1,127 @@
+# src/summarizer/components/decoding.py
+import threading
+
+STRATEGIES = ("greedy", "beam", "sample")
+
+# Weight of the newest observation in the per-policy latency average
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class UnknownPolicyError(Exception):
+    pass
+
+
+def generate_kwargs(policy):
+    # model.generate() arguments for a DecodingPolicy
+    if policy.strategy == "greedy":
+        return {"num_beams": 1, "do_sample": False, "early_stopping": False}
+    if policy.strategy == "beam":
+        return {"num_beams": policy.num_beams, "do_sample": False, "early_stopping": True,
+                "length_penalty": policy.length_penalty}
+    if policy.strategy == "sample":
+        return {"num_beams": 1, "do_sample": True, "early_stopping": False, "top_k": policy.top_k,
+                "top_p": policy.top_p, "temperature": policy.temperature}
+    raise ValueError(f"Unknown decoding strategy '{policy.strategy}', expected one of {STRATEGIES}")
+
+
+def describe(policy):
+    info = {"policy": policy.name, "strategy": policy.strategy}
+    if policy.strategy == "beam":
+        info.update(num_beams=policy.num_beams, length_penalty=policy.length_penalty)
+    elif policy.strategy == "sample":
+        info.update(top_k=policy.top_k, top_p=policy.top_p, temperature=policy.temperature)
+    return info
+
+
+# Named decoding policies plus the rules for downgrading a request that has a
+# deadline. A request with deadline_ms moves one step down its policy's
+# fallback chain when the queue is deep or the input is long, and keeps moving
+# down while the recent average latency of the current policy (scaled by the
+# batches queued ahead of it) would still exceed the deadline.
+class DecodingPolicies:
+    def __init__(self, config):
+        for policy in config.policies.values():
+            generate_kwargs(policy)  # validates the strategy
+            if policy.fallback is not None and policy.fallback not in config.policies:
+                raise ValueError(f"Decoding policy '{policy.name}' falls back to unknown '{policy.fallback}'")
+        self.policies = config.policies
+        self.default_policy = self.get(config.default_policy).name
+        self.batch_policy = self.get(config.batch_policy).name
+        self.deep_queue = config.deep_queue
+        self.long_input_tokens = config.long_input_tokens
+        self._latency_ms = {}
+        self._lock = threading.Lock()
+
+    def get(self, name=None):
+        name = name or self.default_policy
+        if name not in self.policies:
+            raise UnknownPolicyError(f"Unknown decoding policy '{name}', available: {', '.join(self.policies)}")
+        return self.policies[name]
+
+    def observe(self, name, seconds):
+        with self._lock:
+            previous = self._latency_ms.get(name)
+            value = seconds * 1000
+            self._latency_ms[name] = value if previous is None else (
+                LATENCY_EWMA_ALPHA * value + (1 - LATENCY_EWMA_ALPHA) * previous
+            )
+
+    def estimate_ms(self, name, queued_batches=0):
+        with self._lock:
+            latency = self._latency_ms.get(name)
+        return None if latency is None else latency * (1 + queued_batches)
+
+    def resolve(self, name=None, deadline_ms=None, input_tokens=0, queue_depth=0, max_batch_size=1,
+                streaming=False):
+        # Returns (policy, reason); reason says why a cheaper policy was used
+        policy = self.get(name)
+        reasons = []
+        seen = {policy.name}
+        if deadline_ms is not None:
+            policy = self._meet_deadline(policy, deadline_ms, input_tokens, queue_depth, max_batch_size, reasons,
+                                         seen)
+        if streaming:
+            # Beam search keeps several hypotheses until the end, so it has no
+            # partial output to stream; use the first policy down the chain
+            # that decodes one sequence
+            while policy.strategy == "beam":
+                if policy.fallback is None or policy.fallback in seen:
+                    raise ValueError(f"Decoding policy '{policy.name}' uses beam search, which cannot stream, "
+                                     f"and has no streamable fallback")
+                reasons.append(f"{policy.name} uses beam search, which cannot stream")
+                policy = self.policies[policy.fallback]
+                seen.add(policy.name)
+        return policy, "; ".join(reasons) or None
+
+    def _meet_deadline(self, policy, deadline_ms, input_tokens, queue_depth, max_batch_size, reasons, seen):
+        if policy.fallback is not None:
+            if self.deep_queue and queue_depth >= self.deep_queue:
+                reasons.append(f"queue_depth={queue_depth}")
+            elif self.long_input_tokens and input_tokens >= self.long_input_tokens:
+                reasons.append(f"input_tokens={input_tokens}")
+            if reasons:
+                policy = self.policies[policy.fallback]
+                seen.add(policy.name)
+
+        queued_batches = queue_depth // max(int(max_batch_size), 1)
+        while policy.fallback is not None and policy.fallback not in seen:
+            estimate = self.estimate_ms(policy.name, queued_batches)
+            if estimate is None or estimate <= deadline_ms:
+                break
+            reasons.append(f"{policy.name} estimated {estimate:.0f}ms > deadline {deadline_ms:.0f}ms")
+            policy = self.policies[policy.fallback]
+            seen.add(policy.name)
+        return policy
+
+    def status(self):
+        with self._lock:
+            latency = dict(self._latency_ms)
+        return {
+            "default": self.default_policy,
+            "batch": self.batch_policy,
+            "policies": {
+                name: {**describe(policy), "fallback": policy.fallback,
+                       "recent_latency_ms": round(latency[name], 1) if name in latency else None}
+                for name, policy in self.policies.items()
+            },
+        }
@@ -0,0 +1,298 @@
+# src/summarizer/components/downloader.py
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import threading
+import time
+import urllib.request as request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import URLError
+
+from src.summarizer.logging import logger
+
+BLOCK_SIZE = 1 << 20
+
+
+class DownloadError(Exception):
+    pass
+
+
+# sha256 of a file whose segments are written out of order. The digest only
+# advances over the finished prefix of the file: a block written exactly at
+# the hash position is hashed from memory; bytes that arrived ahead of it are
+# read back when a segment finishes, while the others are still downloading
+# and the data is still in the page cache. Callers hold `lock` around
+# written() together with their progress update.
+class _SegmentHasher:
+    def __init__(self, path, segments, lock):
+        self.path = path
+        self.segments = segments  # [start, end, done], shared with the download state
+        self.lock = lock
+        self.position = 0
+        self._digest = hashlib.sha256()
+
+    def written(self, offset, block):
+        if offset == self.position:
+            self._digest.update(block)
+            self.position += len(block)
+
+    def _available(self):
+        # End (exclusive) of the bytes on disk that follow the hash position
+        for start, end, done in self.segments:
+            if start <= self.position <= end:
+                return start + done
+        return self.position
+
+    def catch_up(self):
+        with open(self.path, "rb") as f:
+            while True:
+                with self.lock:
+                    available = self._available()
+                    if available <= self.position:
+                        return
+                    f.seek(self.position)
+                    block = f.read(min(BLOCK_SIZE, available - self.position))
+                    if not block:
+                        return
+                    self._digest.update(block)
+                    self.position += len(block)
+
+    def hexdigest(self):
+        self.catch_up()
+        return self._digest.hexdigest()
+
+
+# HTTP downloads that resume after interruption, split large files into
+# parallel range requests, and verify the result before it is moved into place.
+#
+#   <dest>.part       bytes downloaded so far (segments written at their offsets)
+#   <dest>.part.json  url, size, etag and how far each segment got
+#   <cache_dir>/      completed files by sha256, plus index.json (url -> sha256
+#                     and the ETag/Last-Modified/size it was downloaded with)
+#
+# A finished file is always verified: against `sha256` when one is given,
+# otherwise against the server's Content-Length. Without a pinned `sha256` a
+# cached copy is only reused while the server still reports the same
+# validators for the URL.
+class Downloader:
+    def __init__(self, cache_dir="artifacts/download_cache", num_segments=4, min_segment_bytes=4 * BLOCK_SIZE,
+                 timeout=30, retries=3):
+        self.cache_dir = cache_dir
+        self.num_segments = max(int(num_segments), 1)
+        self.min_segment_bytes = min_segment_bytes
+        self.timeout = timeout
+        self.retries = max(int(retries), 1)
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    # ---------- content-addressed cache ----------
+    def _index_path(self):
+        return os.path.join(self.cache_dir, "index.json")
+
+    def _read_index(self):
+        if not os.path.exists(self._index_path()):
+            return {}
+        with open(self._index_path()) as f:
+            return json.load(f)
+
+    def _cached_path(self, sha256):
+        path = os.path.join(self.cache_dir, sha256)
+        return path if os.path.exists(path) else None
+
+    def _index_entry(self, url):
+        entry = self._read_index().get(url)
+        # Entries written before validators were recorded hold just the sha256
+        return {"sha256": entry} if isinstance(entry, str) else entry
+
+    @staticmethod
+    def _is_fresh(entry, remote):
+        # Same size and the same ETag/Last-Modified; a server that sends
+        # neither cannot prove the file is unchanged
+        validators = ("etag", "last_modified")
+        if not any(remote[key] for key in validators):
+            return False
+        return all(entry.get(key) == remote[key] for key in ("size", *validators))
+
+    def _add_to_cache(self, url, path, sha256, remote):
+        cached = os.path.join(self.cache_dir, sha256)
+        if not os.path.exists(cached):
+            _link_or_copy(path, cached)
+        index = self._read_index()
+        index[url] = {"sha256": sha256, "size": remote["size"], "etag": remote["etag"],
+                      "last_modified": remote["last_modified"]}
+        tmp_path = self._index_path() + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f, indent=2)
+        os.replace(tmp_path, self._index_path())
+
+    # ---------- HTTP ----------
+    def _open(self, url, start=None, end=None, method="GET"):
+        req = request.Request(url, method=method)
+        if start is not None:
+            req.add_header("Range", f"bytes={start}-{'' if end is None else end}")
+        return request.urlopen(req, timeout=self.timeout)
+
+    def _probe(self, url):
+        # Ask for the first byte: a 206 answer proves range support and its
+        # Content-Range carries the full size
+        with self._open(url, 0, 0) as resp:
+            remote = {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+            if resp.status == 206:
+                size = resp.headers.get("Content-Range", "").rsplit("/", 1)[-1]
+                remote.update(size=int(size) if size.isdigit() else None, ranges=True)
+            else:
+                length = resp.headers.get("Content-Length")
+                remote.update(size=int(length) if length else None, ranges=False)
+            return remote
+
+    def _fetch_segment(self, url, part_path, state_path, state, index, hasher):
+        start, end, done = state["segments"][index]
+        for attempt in range(self.retries):
+            try:
+                if start + done > end:
+                    break
+                with self._open(url, start + done, end) as resp, open(part_path, "r+b") as out:
+                    if resp.status != 206:
+                        raise DownloadError(f"Server ignored range request for {url}")
+                    out.seek(start + done)
+                    for n, block in enumerate(iter(lambda: resp.read(BLOCK_SIZE), b""), 1):
+                        # Bytes must reach the file before the state (or the
+                        # hasher reading it back) claims them
+                        out.write(block)
+                        out.flush()
+                        with self._lock:
+                            hasher.written(start + done, block)
+                            done += len(block)
+                            state["segments"][index][2] = done
+                        if n % 16 == 0:
+                            self._save_state(state_path, state)
+                # A connection closed early ends the read short; the next
+                # attempt asks for the rest
+            except (URLError, OSError, http.client.HTTPException) as e:
+                logger.warning(f"Segment {index} of {url} failed ({e}), retry {attempt + 1}/{self.retries}")
+                time.sleep(min(2 ** attempt, 10))
+        if start + done <= end:
+            raise DownloadError(f"Segment {index} of {url} failed after {self.retries} attempts")
+        hasher.catch_up()
+
+    def _save_state(self, state_path, state):
+        with self._lock:
+            tmp_path = state_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, state_path)
+
+    def _fetch_stream(self, url, part_path, resumable):
+        # Single connection; picks up from the end of an existing .part file
+        # when the server honours ranges, and hashes while writing
+        offset = os.path.getsize(part_path) if resumable and os.path.exists(part_path) else 0
+        with self._open(url, offset if offset else None) as resp:
+            if offset and resp.status != 206:
+                # The whole file came back instead of the rest: start over
+                logger.info(f"Server ignored the resume range for {url}, downloading from the start")
+                offset = 0
+            digest = hashlib.sha256()
+            if offset:
+                with open(part_path, "rb") as f:
+                    for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+                        digest.update(block)
+            with open(part_path, "ab" if offset else "wb") as out:
+                for block in iter(lambda: resp.read(BLOCK_SIZE), b""):
+                    out.write(block)
+                    digest.update(block)
+        return digest.hexdigest()
+
+    # ---------- public API ----------
+    def _use_cached(self, url, cached, dest):
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        if not (os.path.exists(dest) and os.path.samefile(cached, dest)):
+            tmp_path = dest + ".tmp"
+            _link_or_copy(cached, tmp_path)
+            os.replace(tmp_path, dest)
+        logger.info(f"Using cached download for {url} ({os.path.basename(cached)[:12]})")
+        return dest
+
+    def fetch(self, url, dest, sha256=None):
+        # A pinned checksum identifies the content, so no need to ask the server
+        cached = self._cached_path(sha256.lower()) if sha256 else None
+        if cached is not None:
+            return self._use_cached(url, cached, dest)
+
+        entry = None if sha256 else self._index_entry(url)
+        cached = self._cached_path(entry["sha256"]) if entry else None
+        try:
+            remote = self._probe(url)
+        except (URLError, OSError, http.client.HTTPException) as e:
+            if cached is None:
+                raise
+            logger.warning(f"Could not revalidate {url} ({e}), using the cached copy")
+            return self._use_cached(url, cached, dest)
+        if cached is not None:
+            if self._is_fresh(entry, remote):
+                return self._use_cached(url, cached, dest)
+            logger.info(f"{url} changed upstream since it was cached, downloading it again")
+
+        os.makedirs(os.path.dirname(dest) or ".", exist_ok=True)
+        part_path, state_path = dest + ".part", dest + ".part.json"
+        size, ranges, etag = remote["size"], remote["ranges"], remote["etag"]
+        started = time.perf_counter()
+
+        if ranges and size:
+            # Resume only into a .part file made from the same remote file
+            state = None
+            if os.path.exists(state_path) and os.path.exists(part_path):
+                with open(state_path) as f:
+                    state = json.load(f)
+                if (state["url"], state["size"], state["etag"]) != (url, size, etag):
+                    state = None
+            if state is None:
+                num_segments = max(1, min(self.num_segments, size // self.min_segment_bytes))
+                bounds = [size * k // num_segments for k in range(num_segments + 1)]
+                state = {"url": url, "size": size, "etag": etag,
+                         "segments": [[bounds[k], bounds[k + 1] - 1, 0] for k in range(num_segments)]}
+                with open(part_path, "wb") as f:
+                    f.truncate(size)
+            else:
+                resumed = sum(done for _, _, done in state["segments"])
+                logger.info(f"Resuming {url} at {resumed}/{size} bytes")
+
+            hasher = _SegmentHasher(part_path, state["segments"], self._lock)
+            try:
+                with ThreadPoolExecutor(max_workers=len(state["segments"]), thread_name_prefix="download") as pool:
+                    futures = [pool.submit(self._fetch_segment, url, part_path, state_path, state, k, hasher)
+                               for k in range(len(state["segments"]))]
+                    for future in futures:
+                        future.result()
+            finally:
+                # Saved once every segment has stopped, so the progress of all
+                # of them survives a crash or Ctrl-C for the next attempt
+                self._save_state(state_path, state)
+            digest = hasher.hexdigest()
+        else:
+            digest = self._fetch_stream(url, part_path, ranges)
+
+        actual_size = os.path.getsize(part_path)
+        if size is not None and actual_size != size:
+            raise DownloadError(f"Downloaded {actual_size} bytes from {url}, expected {size}")
+        if sha256 and digest != sha256.lower():
+            os.remove(part_path)
+            if os.path.exists(state_path):
+                os.remove(state_path)
+            raise DownloadError(f"Checksum mismatch for {url}: got {digest}, expected {sha256}")
+
+        os.replace(part_path, dest)
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        self._add_to_cache(url, dest, digest, remote)
+        elapsed = time.perf_counter() - started
+        logger.info(f"Downloaded {url} ({actual_size} bytes, sha256 {digest[:12]}) in {elapsed:.1f}s")
+        return dest
+
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
@@ -0,0 +1,69 @@
+# src/summarizer/components/encoder_cache.py
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict
+
+
+# Encoder hidden states per input sequence, keyed by model and token ids and
+# kept in least-recently-used order within a byte budget. Generation settings
+# (max_length, min_length, beams) only affect decoding, so a text that comes
+# back with other settings skips the encoder pass entirely.
+class EncoderCache:
+    def __init__(self, max_entries=1024, max_bytes=256 * 1024 * 1024):
+        self.max_entries = max(int(max_entries), 1)
+        self.max_bytes = max(int(max_bytes), 1)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(model_id, token_ids):
+        digest = hashlib.blake2b(model_id.encode("utf-8"), digest_size=16)
+        digest.update(array("q", token_ids).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _entry_size(hidden):
+        return hidden.numel() * hidden.element_size()
+
+    def get(self, key):
+        with self._lock:
+            hidden = self._entries.get(key)
+            if hidden is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return hidden
+
+    def put(self, key, hidden):
+        # hidden: (sequence length, hidden size), without padding. Copied so a
+        # slice does not keep the whole batch's activations alive.
+        hidden = hidden.detach().clone()
+        size = self._entry_size(hidden)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entry_size(self._entries.pop(key))
+            self._entries[key] = hidden
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, old = self._entries.popitem(last=False)
+                self._bytes -= self._entry_size(old)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
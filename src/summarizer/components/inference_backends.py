@@ -0,0 +1,42 @@
+# src/summarizer/components/inference_backends.py
+import os
+import torch
+from transformers import AutoModelForSeq2SeqLM
+from src.summarizer.components.tokenization import load_tokenizer
+
+BACKENDS = ("pytorch", "int8", "onnx")
+
+
+def load_backend(model_path, backend="pytorch", onnx_dir=None, require_fast_tokenizer=False):
+    # Returns (model, tokenizer, device, artifact_dir) for the requested backend.
+    # All backends expose the same generate() API, so ModelPrediction does not
+    # need to know which one it is driving.
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{backend}', expected one of {BACKENDS}")
+
+    if backend == "onnx":
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise ImportError("The onnx backend needs optimum[onnxruntime] installed") from e
+        onnx_dir = onnx_dir or os.path.join(os.path.dirname(os.path.abspath(model_path)), "model_onnx")
+        if not os.path.isdir(onnx_dir):
+            raise FileNotFoundError(f"No exported ONNX model at {onnx_dir}; run export_model.py first")
+        # Encoder/decoder sessions with past key values so each decode step is incremental
+        model = ORTModelForSeq2SeqLM.from_pretrained(onnx_dir, use_cache=True)
+        tokenizer = load_tokenizer(onnx_dir, require_fast_tokenizer)
+        return model, tokenizer, "cpu", onnx_dir
+
+    tokenizer = load_tokenizer(model_path, require_fast_tokenizer)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_path)
+    model.eval()
+
+    if backend == "int8":
+        # Dynamic quantization: Linear weights stored as int8, activations
+        # quantized on the fly. CPU only.
+        model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model, tokenizer, "cpu", model_path
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    model.to(device)
+    return model, tokenizer, device, model_path
@@ -0,0 +1,76 @@
+# src/summarizer/components/inference_executor.py
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.summarizer.logging import logger
+
+
+class InferenceBusyError(Exception):
+    pass
+
+
+# Bounded worker pool for blocking model calls. At most max_pending calls may
+# be queued or running at once; anything beyond that is rejected immediately
+# so the API can answer with 503 instead of letting latency pile up.
+class InferenceExecutor:
+    def __init__(self, max_workers=1, max_pending=16):
+        self.max_workers = max(int(max_workers), 1)
+        self.max_pending = max(int(max_pending), self.max_workers)
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._slot_free = threading.Condition(self._lock)
+        self._pending = 0
+        logger.info(
+            f"InferenceExecutor started (max_workers={self.max_workers}, max_pending={self.max_pending})"
+        )
+
+    @property
+    def pending(self):
+        return self._pending
+
+    def is_saturated(self):
+        return self._pending >= self.max_pending
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+            self._slot_free.notify()
+
+    def _acquire(self, wait):
+        with self._slot_free:
+            if wait:
+                while self._pending >= self.max_pending:
+                    self._slot_free.wait()
+            elif self._pending >= self.max_pending:
+                raise InferenceBusyError(
+                    f"Inference queue is full ({self._pending}/{self.max_pending} pending)"
+                )
+            self._pending += 1
+
+    def _dispatch(self, fn, *args, **kwargs):
+        try:
+            # Carry the caller's context (e.g. the request id used in logs) onto the worker
+            future = self._pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def submit(self, fn, *args, **kwargs):
+        self._acquire(wait=False)
+        return self._dispatch(fn, *args, **kwargs)
+
+    async def run(self, fn, *args, **kwargs):
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def call(self, fn, *args, **kwargs):
+        # For callers already on a worker thread (e.g. a streaming response that
+        # has started sending): wait for a free slot instead of failing
+        self._acquire(wait=True)
+        return self._dispatch(fn, *args, **kwargs).result()
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
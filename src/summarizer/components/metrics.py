@@ -0,0 +1,241 @@
+# src/summarizer/components/metrics.py
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+# Minimal in-process metrics in the Prometheus text exposition format
+# (counters, gauges, histograms with labels), so /metrics needs no extra
+# dependency. All updates are thread-safe; values can also come from a
+# function evaluated at scrape time (queue depths, cache stats).
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._function = None
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set_function(self, function):
+        # function() -> value, or {label values tuple: value} for labelled metrics
+        self._function = function
+
+    def _samples(self):
+        if self._function is not None:
+            value = self._function()
+            values = value if isinstance(value, dict) else {(): value}
+        else:
+            with self._lock:
+                values = dict(self._values)
+        return [(self.name, key, (), value) for key, value in sorted(values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, extra, value in self._samples():
+            lines.append(f"{name}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            state["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self):
+        with self._lock:
+            values = {key: {"counts": list(s["counts"]), "sum": s["sum"], "count": s["count"]}
+                      for key, s in self._values.items()}
+        samples = []
+        for key, state in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state["counts"]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", key, (("le", _format_value(bound)),), cumulative))
+            samples.append((f"{self.name}_sum", key, (), state["sum"]))
+            samples.append((f"{self.name}_count", key, (), state["count"]))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return Counter(self, name, help_text, labelnames)
+
+    def gauge(self, name, help_text, labelnames=()):
+        return Gauge(self, name, help_text, labelnames)
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return Histogram(self, name, help_text, labelnames, buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# ---------- model hot path (ModelPrediction) ----------
+TOKENIZE_SECONDS = REGISTRY.histogram(
+    "summarizer_tokenize_seconds", "Time spent tokenizing a batch of inputs")
+ENCODE_SECONDS = REGISTRY.histogram(
+    "summarizer_encode_seconds", "Time spent running the encoder on inputs missing from the encoder cache")
+GENERATE_SECONDS = REGISTRY.histogram(
+    "summarizer_generate_seconds", "Time spent in model.generate per batch", ["mode"])
+DECODE_SECONDS = REGISTRY.histogram(
+    "summarizer_decode_seconds", "Time spent decoding generated ids per batch")
+INPUT_TOKENS = REGISTRY.histogram(
+    "summarizer_input_tokens", "Input tokens per sequence sent to the model", buckets=TOKEN_BUCKETS)
+OUTPUT_TOKENS = REGISTRY.histogram(
+    "summarizer_output_tokens", "Generated tokens per sequence", buckets=TOKEN_BUCKETS)
+BATCH_SIZE = REGISTRY.histogram(
+    "summarizer_batch_size", "Sequences per batch", ["stage"], buckets=BATCH_BUCKETS)
+
+# ---------- serving (app, micro-batcher, executor, cache) ----------
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "summarizer_queue_wait_seconds", "Time a request waited in the micro-batcher queue")
+QUEUE_DEPTH = REGISTRY.gauge(
+    "summarizer_queue_depth", "Requests waiting in the micro-batcher queue")
+INFERENCE_PENDING = REGISTRY.gauge(
+    "summarizer_inference_pending", "Model calls queued or running on the inference executor")
+CACHE_LOOKUPS = REGISTRY.counter(
+    "summarizer_cache_lookups_total", "Summary cache lookups", ["result"])
+CACHE_HIT_RATE = REGISTRY.gauge(
+    "summarizer_cache_hit_rate", "Fraction of summary cache lookups that were hits")
+ENCODER_CACHE_LOOKUPS = REGISTRY.counter(
+    "summarizer_encoder_cache_lookups_total", "Encoder output cache lookups", ["result"])
+ENCODER_CACHE_BYTES = REGISTRY.gauge(
+    "summarizer_encoder_cache_bytes", "Bytes of encoder hidden states held in the encoder cache")
+DEDUP_GENERATIONS_SAVED = REGISTRY.counter(
+    "summarizer_dedup_generations_saved_total", "CSV rows answered from a duplicate row's summary")
+HTTP_IN_FLIGHT = REGISTRY.gauge(
+    "summarizer_http_requests_in_flight", "Requests currently being handled", ["path"])
+HTTP_REQUESTS = REGISTRY.counter(
+    "summarizer_http_requests_total", "Handled HTTP requests", ["method", "path", "status"])
+HTTP_DURATION_SECONDS = REGISTRY.histogram(
+    "summarizer_http_request_duration_seconds", "Time to handle a request, including the full response body",
+    ["method", "path"])
+
+
+# Pure ASGI middleware rather than @app.middleware("http"): it sees the end of
+# streaming bodies (SSE, CSV), so durations cover the whole response. Paths
+# are reported as route templates to keep label cardinality bounded.
+class MetricsMiddleware:
+    def __init__(self, app, routes):
+        self.app = app
+        self.routes = routes
+
+    def _route_path(self, scope):
+        from starlette.routing import Match
+
+        for route in self.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "path", "other")
+        return "other"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = self._route_path(scope)
+        method = scope["method"]
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc(path=path)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec(path=path)
+            HTTP_DURATION_SECONDS.observe(time.perf_counter() - started, method=method, path=path)
+            HTTP_REQUESTS.inc(method=method, path=path, status=status["code"])
@@ -0,0 +1,198 @@
+# src/summarizer/components/micro_batcher.py
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from src.summarizer.components import metrics
+from src.summarizer.components.inference_executor import InferenceBusyError
+from src.summarizer.logging import logger
+
+
+@dataclass
+class _PendingRequest:
+    text: str
+    params: tuple
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    encoding: tuple = None  # (model_id, concurrent Future of token ids) when pre-tokenized
+    on_generated: object = None  # called with the batch's generate seconds
+
+
+# Collects concurrent summarize requests for a short window and runs them
+# as one padded generate call, handing each caller its own summary. With
+# `pretokenize`, each request is tokenized on a separate pool as soon as it is
+# queued, so the next batch is tokenized while the current one generates.
+# Up to one batch per inference worker generates at a time; the next batch is
+# collected as soon as a worker is free, while earlier batches still run.
+class MicroBatcher:
+    def __init__(self, get_predictor, executor, max_batch_size=8, max_wait_ms=10, max_queue_size=64,
+                 pretokenize=None):
+        self.get_predictor = get_predictor
+        self.executor = executor
+        self.pretokenize = pretokenize
+        self.max_queue_size = max(int(max_queue_size), 1)
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.max_wait = max(float(max_wait_ms), 0.0) / 1000.0
+        self.max_in_flight = executor.max_workers
+        self._queue = None
+        self._worker = None
+        self._carry = None
+        self._slots = None
+        self._in_flight = set()
+
+    async def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+            self._worker = asyncio.create_task(self._run())
+            logger.info(
+                f"MicroBatcher started (max_batch_size={self.max_batch_size}, "
+                f"max_wait_ms={self.max_wait * 1000:.0f}, max_in_flight={self.max_in_flight})"
+            )
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        for task in list(self._in_flight):
+            task.cancel()
+
+    @property
+    def queue_depth(self):
+        waiting = self._queue.qsize() if self._queue is not None else 0
+        return waiting + (1 if self._carry is not None else 0)
+
+    async def summarize(self, text, max_length=128, min_length=30, model=None, generate_kwargs=None,
+                        on_generated=None):
+        # on_generated(seconds) gets the time the batch took on the inference
+        # worker, without the time spent queued; requests in one batch that
+        # pass the same callback share one call
+        if self._worker is None:
+            await self.start()
+        if self._queue.qsize() >= self.max_queue_size:
+            raise InferenceBusyError(f"Summarize queue is full ({self.max_queue_size} waiting)")
+        future = asyncio.get_running_loop().create_future()
+        decoding = tuple(sorted((generate_kwargs or {}).items()))
+        request = _PendingRequest(text, (max_length, min_length, model, decoding), future,
+                                  on_generated=on_generated)
+        if self.pretokenize is not None:
+            try:
+                request.encoding = self.pretokenize(model, text)
+            except Exception as e:
+                # e.g. the model is not loaded yet; the worker tokenizes instead
+                logger.debug(f"Pre-tokenization skipped: {e}")
+        await self._queue.put(request)
+        return await future
+
+    async def _next_request(self):
+        if self._carry is not None:
+            request, self._carry = self._carry, None
+            return request
+        return await self._queue.get()
+
+    async def _collect_batch(self):
+        # Block for the first request, then keep filling the batch until it is
+        # full or the wait window has elapsed
+        first = await self._next_request()
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    request = await asyncio.wait_for(self._queue.get(), timeout)
+                else:
+                    # Window elapsed: still take whatever is already waiting
+                    request = self._queue.get_nowait()
+            except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                break
+            # Requests for different models, lengths or decoding policies cannot share a generate call
+            if request.params != first.params:
+                self._carry = request
+                break
+            batch.append(request)
+        return batch
+
+    async def _run(self):
+        while True:
+            # Wait for a free inference worker before closing a batch, so
+            # requests that arrive meanwhile still join it
+            await self._slots.acquire()
+            try:
+                batch = await self._collect_batch()
+            except BaseException:
+                self._slots.release()
+                raise
+            batch = [r for r in batch if not r.future.cancelled()]
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._dispatch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch):
+        try:
+            dispatched_at = time.monotonic()
+            for r in batch:
+                metrics.QUEUE_WAIT_SECONDS.observe(dispatched_at - r.enqueued_at)
+            metrics.BATCH_SIZE.observe(len(batch), stage="micro_batch")
+            max_length, min_length, model, decoding = batch[0].params
+            texts = [r.text for r in batch]
+            try:
+                encoded = await self._gather_encodings(batch)
+                summaries, seconds = await self.executor.run(self._summarize_batch, model, texts, max_length,
+                                                             min_length, dict(decoding), encoded)
+            except BaseException as e:
+                if not isinstance(e, (InferenceBusyError, asyncio.CancelledError)):
+                    logger.exception(f"MicroBatcher batch of {len(batch)} failed: {e}")
+                for r in batch:
+                    if not r.future.done():
+                        if isinstance(e, asyncio.CancelledError):
+                            r.future.cancel()
+                        else:
+                            r.future.set_exception(e)
+                if not isinstance(e, Exception):
+                    raise
+                return
+            for on_generated in {r.on_generated for r in batch if r.on_generated is not None}:
+                on_generated(seconds)
+            for r, summary in zip(batch, summaries):
+                if not r.future.done():
+                    r.future.set_result(summary)
+        finally:
+            self._slots.release()
+
+    async def _gather_encodings(self, batch):
+        # (model_id, token ids per request), or None to let the worker tokenize
+        if any(r.encoding is None for r in batch):
+            return None
+        model_ids = {r.encoding[0] for r in batch}
+        if len(model_ids) != 1:
+            return None
+        try:
+            results = [await asyncio.wrap_future(r.encoding[1]) for r in batch]
+        except Exception as e:
+            logger.warning(f"Pre-tokenization failed, tokenizing on the worker: {e}")
+            return None
+        return model_ids.pop(), [result["input_ids"][0] for result in results]
+
+    def _summarize_batch(self, model, texts, max_length, min_length, generate_kwargs, encoded=None):
+        # Resolved on the worker thread, so a model swapped in since the
+        # requests were queued is the one that serves them; its tokens are
+        # only reused if they came from that same model. Returns the summaries
+        # and the seconds spent generating them.
+        predictor = self.get_predictor(model)
+        input_ids = None
+        if encoded is not None and encoded[0] == predictor.model_id:
+            input_ids = encoded[1]
+        started = time.perf_counter()
+        summaries = predictor.summarize_batch(
+            texts, batch_size=len(texts), max_length=max_length, min_length=min_length, input_ids=input_ids,
+            **generate_kwargs
+        )
+        return summaries, time.perf_counter() - started
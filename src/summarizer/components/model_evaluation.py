@@ -0,0 +1,205 @@
+# src/summarizer/components/model_evaluation.py
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+import pandas as pd
+from src.summarizer.logging import logger, setup_logging
+
+ROUGE_TYPES = ["rouge1", "rouge2", "rougeL", "rougeLsum"]
+
+
+def _shard_path(predictions_dir, shard):
+    return os.path.join(predictions_dir, f"shard_{shard:02d}.jsonl")
+
+
+def _empty_sums():
+    return {"count": 0, **{key: 0.0 for key in ROUGE_TYPES}}
+
+
+def _add_scores(sums, scores):
+    sums["count"] += 1
+    for key in ROUGE_TYPES:
+        sums[key] += scores[key]
+
+
+def _evaluate_shard(shard, items, config, num_threads):
+    # Runs in a worker process (or in-process for a single shard). Predictions
+    # are appended to this shard's jsonl file chunk by chunk, with ROUGE sums
+    # kept up to date in shard_XX.json alongside it.
+    import torch
+    from rouge_score import rouge_scorer
+    from src.summarizer.components.model_prediction import ModelPrediction
+    from src.summarizer.components.decoding import generate_kwargs
+
+    if num_threads:
+        torch.set_num_threads(num_threads)
+    predictor = ModelPrediction(model_path=config.model_path)
+    scorer = rouge_scorer.RougeScorer(ROUGE_TYPES)
+
+    sums = _empty_sums()
+    stats_path = os.path.join(config.predictions_dir, f"shard_{shard:02d}.json")
+    started = time.perf_counter()
+    with open(_shard_path(config.predictions_dir, shard), "a", encoding="utf-8") as out:
+        for start in range(0, len(items), config.chunk_size):
+            chunk = items[start:start + config.chunk_size]
+            inputs = [source for _, source, _ in chunk]
+            generation = dict(
+                batch_size=config.batch_size,
+                max_length=config.max_length,
+                min_length=None,
+                **generate_kwargs(config.decoding)
+            )
+            if isinstance(inputs[0], str):
+                predictions = predictor.summarize_batch(inputs, max_input_length=config.max_input_length,
+                                                        **generation)
+            else:
+                # Already tokenized by the dataset store
+                predictions = predictor.summarize_token_ids(inputs, **generation)
+            for (index, _, reference), prediction in zip(chunk, predictions):
+                result = scorer.score(reference, prediction)
+                scores = {key: result[key].fmeasure for key in ROUGE_TYPES}
+                _add_scores(sums, scores)
+                out.write(json.dumps({"index": index, "prediction": prediction, "scores": scores}) + "\n")
+            out.flush()
+
+            with open(stats_path, "w") as f:
+                json.dump(sums, f)
+            done = min(start + config.chunk_size, len(items))
+            logger.info(
+                f"Evaluation shard {shard}: {done}/{len(items)} examples "
+                f"({done / (time.perf_counter() - started):.2f} ex/s)"
+            )
+    return sums
+
+
+def _evaluate_shard_in_worker(shard, items, config, num_threads):
+    # Each worker process logs to its own file: rotating the main log from
+    # several processes would lose records
+    setup_logging(file_suffix=f".shard{shard:02d}")
+    return _evaluate_shard(shard, items, config, num_threads)
+
+
+class ModelEvaluation:
+    def __init__(self, config, tokenization_config=None):
+        self.config = config
+        self.tokenization_config = tokenization_config
+
+    def _load_examples(self, eval_path):
+        if self.tokenization_config is not None:
+            from src.summarizer.components.tokenization import load_tokenizer
+            from src.summarizer.components.tokenized_store import TokenizedDatasetStore
+
+            store = TokenizedDatasetStore(
+                self.tokenization_config.root_dir,
+                load_tokenizer(self.config.model_path),
+                max_input_length=self.config.max_input_length,
+                max_target_length=self.tokenization_config.max_target_length,
+                num_proc=self.tokenization_config.num_proc
+            )
+            dataset = store.load("validation", eval_path, keep_columns=("summary",))
+            return list(zip(range(len(dataset)), dataset["input_ids"], dataset["summary"]))
+
+        df = pd.read_csv(eval_path)
+        df["dialogue"] = df["dialogue"].astype(str).fillna("")
+        df["summary"] = df["summary"].astype(str).fillna("")
+        return list(zip(range(len(df)), df["dialogue"], df["summary"]))
+
+    def _check_run_fingerprint(self, eval_path):
+        # Saved predictions are only reusable for the same model, data and
+        # generation settings; anything else starts from a clean directory
+        from src.summarizer.components.model_prediction import ModelPrediction
+        from src.summarizer.components.decoding import generate_kwargs
+
+        fingerprint = {
+            "model": ModelPrediction._model_identity(self.config.model_path),
+            "data": os.path.abspath(eval_path),
+            "data_mtime_ns": os.stat(eval_path).st_mtime_ns,
+            "generation": [self.config.max_input_length, self.config.max_length,
+                           generate_kwargs(self.config.decoding)],
+        }
+        path = os.path.join(self.config.predictions_dir, "run.json")
+        if os.path.exists(path):
+            with open(path) as f:
+                if json.load(f) == fingerprint:
+                    return
+            logger.info("Model, data or generation settings changed; discarding saved predictions")
+            shutil.rmtree(self.config.predictions_dir)
+        os.makedirs(self.config.predictions_dir, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(fingerprint, f)
+
+    def _load_finished(self):
+        # Collect predictions from earlier (possibly interrupted) runs. A line
+        # cut off mid-write is dropped and its shard file rewritten without it.
+        done, sums = set(), _empty_sums()
+        for name in sorted(os.listdir(self.config.predictions_dir)):
+            if not name.endswith(".jsonl"):
+                continue
+            path = os.path.join(self.config.predictions_dir, name)
+            valid_lines = []
+            with open(path, encoding="utf-8") as f:
+                lines = f.readlines()
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                valid_lines.append(line if line.endswith("\n") else line + "\n")
+                if record["index"] not in done:
+                    done.add(record["index"])
+                    _add_scores(sums, record["scores"])
+            if len(valid_lines) != len(lines):
+                with open(path, "w", encoding="utf-8") as f:
+                    f.writelines(valid_lines)
+        return done, sums
+
+    def evaluate(self, eval_path=None):
+        eval_path = eval_path or self.config.data_path
+        os.makedirs(self.config.predictions_dir, exist_ok=True)
+        self._check_run_fingerprint(eval_path)
+
+        examples = self._load_examples(eval_path)
+        done, totals = self._load_finished()
+        pending = [example for example in examples if example[0] not in done]
+        if done:
+            logger.info(f"Resuming evaluation: {len(done)} of {len(examples)} predictions already on disk")
+
+        num_workers = self.config.num_workers or os.cpu_count() or 1
+        num_workers = max(1, min(num_workers, len(pending)))
+        # Round-robin over length-sorted examples gives every shard a similar mix
+        pending.sort(key=lambda example: len(example[1]))
+        shards = [pending[k::num_workers] for k in range(num_workers)]
+
+        started = time.perf_counter()
+        if not pending:
+            shard_sums = []
+        elif num_workers == 1:
+            shard_sums = [_evaluate_shard(0, shards[0], self.config, None)]
+        else:
+            # Split the cores between workers so their torch thread pools do not oversubscribe
+            num_threads = max(1, (os.cpu_count() or num_workers) // num_workers)
+            logger.info(f"Evaluating {len(pending)} examples on {num_workers} processes x {num_threads} threads")
+            with ProcessPoolExecutor(max_workers=num_workers, mp_context=get_context("spawn")) as pool:
+                futures = [
+                    pool.submit(_evaluate_shard_in_worker, k, shard, self.config, num_threads)
+                    for k, shard in enumerate(shards)
+                ]
+                shard_sums = [future.result() for future in futures]
+        if pending:
+            elapsed = time.perf_counter() - started
+            logger.info(f"Generated {len(pending)} predictions in {elapsed:.1f}s")
+
+        for sums in shard_sums:
+            totals["count"] += sums["count"]
+            for key in ROUGE_TYPES:
+                totals[key] += sums[key]
+
+        count = totals["count"]
+        results = {key: totals[key] / count if count else 0.0 for key in ROUGE_TYPES}
+        with open(os.path.join(self.config.root_dir, "metrics.json"), "w") as f:
+            json.dump({**results, "num_examples": count}, f, indent=2)
+        return results
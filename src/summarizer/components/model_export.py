@@ -0,0 +1,25 @@
+# src/summarizer/components/model_export.py
+import os
+from transformers import AutoTokenizer
+from src.summarizer.logging import logger
+
+
+class ModelExporter:
+    def __init__(self, model_path="artifacts/model", onnx_dir="artifacts/model_onnx"):
+        self.model_path = model_path
+        self.onnx_dir = onnx_dir
+
+    def export_onnx(self):
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise ImportError("ONNX export needs optimum[onnxruntime] installed") from e
+
+        # Exports encoder, decoder and decoder-with-past graphs so generation
+        # can reuse the KV cache between steps
+        os.makedirs(self.onnx_dir, exist_ok=True)
+        model = ORTModelForSeq2SeqLM.from_pretrained(self.model_path, export=True, use_cache=True)
+        model.save_pretrained(self.onnx_dir)
+        AutoTokenizer.from_pretrained(self.model_path).save_pretrained(self.onnx_dir)
+        logger.info(f"Exported ONNX model from {self.model_path} to {self.onnx_dir}")
+        return self.onnx_dir
@@ -0,0 +1,162 @@
+# src/summarizer/components/model_loader.py
+import asyncio
+import threading
+import time
+
+from src.summarizer.logging import logger
+
+LOAD_MODES = ("eager", "background", "lazy")
+
+WARMUP_TEXT = (
+    "Amanda: I baked cookies. Do you want some? "
+    "Jerry: Sure! Amanda: I'll bring you tomorrow :-)"
+)
+
+
+class ModelNotReadyError(Exception):
+    pass
+
+
+# Owns the predictor's lifecycle so the server can bind before the model is
+# in memory. Modes:
+#   eager      - load during startup, before the first request is accepted
+#   background - start loading at startup; requests get 503 until ready
+#   lazy       - load on the first request, which waits for it
+class ModelLoader:
+    def __init__(self, factory, mode="background", warmup_requests=0, started_at=None):
+        if mode not in LOAD_MODES:
+            raise ValueError(f"Unknown load mode '{mode}', expected one of {LOAD_MODES}")
+        self.factory = factory
+        self.mode = mode
+        self.warmup_requests = max(int(warmup_requests), 0)
+        self.started_at = started_at if started_at is not None else time.monotonic()
+        self.state = "not_loaded"
+        self.error = None
+        self.timings = {}
+        self.swaps = 0
+        self._predictor = None
+        self._reloading = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def start(self):
+        if self.mode == "eager":
+            self.load()
+        elif self.mode == "background":
+            self.start_background()
+
+    def start_background(self):
+        with self._lock:
+            if self.state != "not_loaded":
+                return
+            self.state = "loading"
+        threading.Thread(target=self._load, name="model-loader", daemon=True).start()
+
+    def load(self):
+        with self._lock:
+            if self.state != "not_loaded":
+                return
+            self.state = "loading"
+        self._load()
+
+    def _build(self):
+        t0 = time.monotonic()
+        predictor = self.factory()
+        t1 = time.monotonic()
+        self._warmup(predictor)
+        t2 = time.monotonic()
+        return predictor, {"load_seconds": round(t1 - t0, 3), "warmup_seconds": round(t2 - t1, 3)}
+
+    def _warmup(self, predictor):
+        for _ in range(self.warmup_requests):
+            # Uncached on purpose: the point is to exercise the generate path
+            predictor.generate_batch([WARMUP_TEXT], max_length=16, min_length=1)
+
+    def warmup(self):
+        # For a predictor loaded without warmup, e.g. preloaded in a prefork
+        # master and warmed up in each worker after the fork
+        if self._predictor is not None:
+            self._warmup(self._predictor)
+
+    def _load(self):
+        try:
+            predictor, timings = self._build()
+        except Exception as e:
+            logger.exception(f"Model load failed: {e}")
+            self.error = str(e)
+            self.state = "failed"
+            self._done.set()
+            return
+
+        self.timings = {**timings, "cold_start_seconds": round(time.monotonic() - self.started_at, 3)}
+        self._predictor = predictor
+        self.state = "ready"
+        self._done.set()
+        logger.info(
+            f"Model ready: load {self.timings['load_seconds']}s, warmup {self.timings['warmup_seconds']}s "
+            f"({self.warmup_requests} requests), cold start {self.timings['cold_start_seconds']}s"
+        )
+
+    def reload(self):
+        # Hot swap: the replacement is built and warmed up while the current
+        # predictor keeps serving, then published with a single reference
+        # assignment. Calls already running keep the predictor they hold.
+        with self._lock:
+            if self._reloading:
+                return False
+            self._reloading = True
+        try:
+            predictor, timings = self._build()
+        except Exception as e:
+            logger.exception(f"Model reload failed, still serving the previous model: {e}")
+            self.error = str(e)
+            self._reloading = False
+            return False
+
+        self.timings = {**self.timings, **timings}
+        self.error = None
+        self._predictor = predictor
+        self.state = "ready"
+        self.swaps += 1
+        self._done.set()
+        self._reloading = False
+        logger.info(f"Model hot-swapped: load {timings['load_seconds']}s, warmup {timings['warmup_seconds']}s")
+        return True
+
+    def unload(self):
+        # Drops the loader's reference; memory is released once in-flight
+        # calls holding the predictor finish. The next get() loads it again.
+        with self._lock:
+            if self._predictor is None or self._reloading:
+                return False
+            self._predictor = None
+            self.state = "not_loaded"
+            self._done = threading.Event()
+        return True
+
+    def is_ready(self):
+        return self._predictor is not None
+
+    def get(self, wait=None):
+        if self._predictor is not None:
+            return self._predictor
+        if wait is None:
+            wait = self.mode == "lazy"
+        if wait:
+            self.start_background()
+            self._done.wait()
+        if self._predictor is None:
+            raise ModelNotReadyError(f"Model is {self.state}" + (f": {self.error}" if self.error else ""))
+        return self._predictor
+
+    async def aget(self):
+        # Only leaves the event loop when it actually has to wait for a load
+        if self._predictor is not None:
+            return self._predictor
+        if self.mode == "lazy":
+            return await asyncio.to_thread(self.get, True)
+        return self.get(wait=False)
+
+    def status(self):
+        return {"state": self.state, "mode": self.mode, "error": self.error, "reloading": self._reloading,
+                "swaps": self.swaps, **self.timings}
@@ -1,21 +1,343 @@
 # src/summarizer/components/model_prediction.py
+import hashlib
+import os
+import threading
 import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from transformers import TextIteratorStreamer
+from transformers.modeling_outputs import BaseModelOutput
+from src.summarizer.logging import logger
+from src.summarizer.components.inference_backends import load_backend
+from src.summarizer.components.summary_cache import SummaryCache
+from src.summarizer.components.encoder_cache import EncoderCache
+from src.summarizer.components.tokenization import TokenizationService
+from src.summarizer.components import metrics
 
 class ModelPrediction:
-    def __init__(self, model_path="artifacts/model"):
-        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-        self.model = AutoModelForSeq2SeqLM.from_pretrained(model_path)
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.model.to(self.device)
-
-    def summarize(self, text, max_length=128, min_length=30):
-        inputs = self.tokenizer([text], max_length=1024, truncation=True, return_tensors="pt").to(self.device)
-        summary_ids = self.model.generate(
-            inputs["input_ids"],
-            num_beams=4,
-            max_length=max_length,
-            min_length=min_length,
-            early_stopping=True
+    def __init__(self, model_path="artifacts/model", cache=None, backend="pytorch", onnx_dir=None,
+                 encoder_cache=None, tokenizer_config=None):
+        self.model, self.tokenizer, self.device, artifact_dir = load_backend(
+            model_path, backend, onnx_dir,
+            require_fast_tokenizer=tokenizer_config.require_fast if tokenizer_config else False
         )
-        return self.tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+        self.tokenization = TokenizationService(
+            self.tokenizer,
+            num_threads=tokenizer_config.num_threads if tokenizer_config else 4,
+            shard_size=tokenizer_config.shard_size if tokenizer_config else 64
+        )
+        self.artifact_dir = artifact_dir
+        self.backend = backend
+        self.cache = cache
+        self.encoder_cache = encoder_cache
+        self.model_id = self._model_identity(artifact_dir, backend)
+        # Encoder outputs can be computed separately and handed to generate()
+        # for torch encoder-decoder models; ONNX sessions run their own encoder.
+        # Cached states are unpadded, so re-padding assumes right padding.
+        self.reuses_encoder = (
+            isinstance(self.model, torch.nn.Module)
+            and getattr(self.model.config, "is_encoder_decoder", False)
+            and self.tokenizer.padding_side == "right"
+        )
+        logger.info(f"Loaded model from {artifact_dir} (backend={backend}, device={self.device})")
+
+    @staticmethod
+    def _model_identity(model_path, backend="pytorch"):
+        # Backend, path and size/mtime of every artifact file, so a retrained
+        # model saved to the same directory never serves stale cached summaries
+        digest = hashlib.sha256(f"{backend}:{os.path.abspath(str(model_path))}".encode("utf-8"))
+        if os.path.isdir(model_path):
+            for name in sorted(os.listdir(model_path)):
+                stat = os.stat(os.path.join(model_path, name))
+                digest.update(f"{name}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def memory_bytes(self):
+        # Weights and buffers for torch models; on-disk size for backends that
+        # do not expose parameters (ONNX Runtime sessions)
+        if hasattr(self.model, "state_dict"):
+            total = 0
+            for value in self.model.state_dict().values():
+                # Dynamically quantized Linear layers store (weight, bias) tuples
+                for t in value if isinstance(value, (tuple, list)) else (value,):
+                    if isinstance(t, torch.Tensor):
+                        total += t.numel() * t.element_size()
+            return total
+        total = 0
+        for root, _, files in os.walk(self.artifact_dir):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
+
+    def summarize(self, text, max_length=128, min_length=30, **generate_kwargs):
+        return self.summarize_batch([text], batch_size=1, max_length=max_length, min_length=min_length,
+                                    **generate_kwargs)[0]
+
+    def summarize_long(self, text, chunk_tokens=512, overlap_tokens=64, max_rounds=3, batch_size=8,
+                       max_length=128, min_length=30, **generate_kwargs):
+        # Map-reduce for inputs longer than one window: summarize overlapping
+        # token windows as one batch, join the partial summaries and repeat
+        # until the text fits in a single window, then summarize that
+        chunk_tokens = max(int(chunk_tokens), 8)
+        overlap_tokens = int(overlap_tokens)
+        if not 0 <= overlap_tokens < chunk_tokens:
+            raise ValueError(f"overlap_tokens must be in [0, {chunk_tokens - 1}] for chunk_tokens={chunk_tokens}, "
+                             f"got {overlap_tokens}")
+        step = chunk_tokens - overlap_tokens
+        # Each partial summary must be well under a window, or reducing never converges
+        map_max_length = min(max_length, chunk_tokens // 2)
+        rounds = 0
+        previous_length = None
+        while True:
+            ids = self.tokenization.encode([text], add_special_tokens=False)["input_ids"][0]
+            if len(ids) <= chunk_tokens:
+                break
+            if rounds >= max_rounds:
+                logger.warning(f"Long document still {len(ids)} tokens after max_rounds={max_rounds}; "
+                               f"summarizing it as is, input past the model limit is truncated")
+                break
+            if previous_length is not None and len(ids) >= previous_length:
+                logger.warning(f"Long document stopped shrinking at {len(ids)} tokens after {rounds} rounds")
+                break
+            previous_length = len(ids)
+            windows = [ids[start:start + chunk_tokens] for start in range(0, len(ids) - overlap_tokens, step)]
+            chunks = self.tokenizer.batch_decode(windows, skip_special_tokens=True)
+            partials = self.summarize_batch(
+                chunks,
+                batch_size=batch_size,
+                max_length=map_max_length,
+                min_length=min(min_length, map_max_length // 2),
+                max_input_length=chunk_tokens + 8,
+                **generate_kwargs
+            )
+            logger.info(f"Long document round {rounds + 1}: {len(ids)} tokens -> {len(chunks)} chunk summaries")
+            text = " ".join(p.strip() for p in partials)
+            rounds += 1
+        return self.summarize(text, max_length=max_length, min_length=min_length, **generate_kwargs)
+
+    def summarize_stream(self, text, max_length=128, min_length=30, max_input_length=1024, submit=None,
+                         **generate_kwargs):
+        # Starts generation right away (on `submit`, or a plain thread) and
+        # returns an iterator of decoded text pieces as tokens are produced.
+        # Greedy unless generate_kwargs say otherwise; beam search cannot emit
+        # partial output.
+        generate_kwargs = {"num_beams": 1, "do_sample": False, **generate_kwargs}
+        if generate_kwargs["num_beams"] != 1:
+            raise ValueError("Beam search cannot stream, use num_beams=1")
+        key = None
+        if self.cache is not None and not generate_kwargs["do_sample"]:
+            # Same key as summarize_batch with these settings
+            params = {"early_stopping": True, **generate_kwargs, "max_length": max_length, "min_length": min_length,
+                      "max_input_length": max_input_length}
+            key = SummaryCache.make_key(text, self.model_id, **params)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return iter([cached])
+
+        with metrics.TOKENIZE_SECONDS.time():
+            inputs = self.tokenization.thread_tokenizer()(
+                [str(text)], max_length=max_input_length, truncation=True, return_tensors="pt"
+            ).to(self.device)
+        metrics.INPUT_TOKENS.observe(inputs["input_ids"].shape[1])
+        streamer = TextIteratorStreamer(self.tokenizer, skip_prompt=True, skip_special_tokens=True)
+        errors = []
+
+        def run():
+            try:
+                encoder_kwargs = self._encoder_kwargs(inputs)
+                with torch.no_grad(), metrics.GENERATE_SECONDS.time(mode="stream"):
+                    output_ids = self.model.generate(
+                        inputs["input_ids"],
+                        attention_mask=inputs["attention_mask"],
+                        max_length=max_length,
+                        min_length=min_length,
+                        streamer=streamer,
+                        **generate_kwargs,
+                        **encoder_kwargs
+                    )
+                metrics.OUTPUT_TOKENS.observe(output_ids.shape[1])
+            except Exception as e:
+                logger.exception(f"Streaming generation failed: {e}")
+                errors.append(e)
+                streamer.end()
+
+        if submit is None:
+            threading.Thread(target=run, daemon=True).start()
+        else:
+            submit(run)
+
+        def pieces():
+            parts = []
+            for piece in streamer:
+                if piece:
+                    parts.append(piece)
+                    yield piece
+            if errors:
+                raise errors[0]
+            if key is not None:
+                self.cache.put(key, "".join(parts).strip())
+
+        return pieces()
+
+    def generate_batch(self, texts, max_length=128, min_length=30, max_input_length=1024, **generate_kwargs):
+        # Pad all texts into one batch and run a single generate call
+        with metrics.TOKENIZE_SECONDS.time():
+            inputs = self.tokenization.thread_tokenizer()(
+                list(texts),
+                max_length=max_input_length,
+                truncation=True,
+                padding=True,
+                return_tensors="pt"
+            )
+        return self._generate(inputs, max_length, min_length, **generate_kwargs)
+
+    def pretokenize(self, texts, max_input_length=1024):
+        # Future of the token ids summarize_batch(..., input_ids=) expects for
+        # these texts, encoded on the tokenization pool
+        return self.tokenization.submit(texts, max_length=max_input_length, truncation=True)
+
+    def summarize_batch(self, texts, batch_size=16, max_length=128, min_length=30, max_input_length=1024,
+                        input_ids=None, **generate_kwargs):
+        # input_ids: token ids for the texts from pretokenize(), if already done
+        texts = [str(t) for t in texts]
+        # Sampled summaries are not cached: a repeat should draw a new sample
+        if self.cache is None or generate_kwargs.get("do_sample"):
+            return self._summarize_uncached(texts, batch_size, max_length, min_length, max_input_length,
+                                            input_ids=input_ids, **generate_kwargs)
+
+        params = {"num_beams": 4, "early_stopping": True, **generate_kwargs,
+                  "max_length": max_length, "min_length": min_length, "max_input_length": max_input_length}
+        keys = [SummaryCache.make_key(t, self.model_id, **params) for t in texts]
+        summaries = [self.cache.get(k) for k in keys]
+
+        # Generate each distinct missing input once, even if it repeats in the batch
+        missing = {}
+        for i, (key, summary) in enumerate(zip(keys, summaries)):
+            if summary is None:
+                missing.setdefault(key, []).append(i)
+        if missing:
+            miss_texts = [texts[positions[0]] for positions in missing.values()]
+            miss_ids = None if input_ids is None else [input_ids[positions[0]] for positions in missing.values()]
+            generated = self._summarize_uncached(miss_texts, batch_size, max_length, min_length, max_input_length,
+                                                 input_ids=miss_ids, **generate_kwargs)
+            for (key, positions), summary in zip(missing.items(), generated):
+                self.cache.put(key, summary)
+                for i in positions:
+                    summaries[i] = summary
+        return summaries
+
+    def summarize_variants(self, text, variants, max_input_length=1024, **generate_kwargs):
+        # Several summaries of one text, e.g. a short and a long one, from a
+        # single tokenization and encoder pass. variants: [(max_length, min_length)]
+        text = str(text)
+        params = {"num_beams": 4, "early_stopping": True, **generate_kwargs, "max_input_length": max_input_length}
+        keys = [None] * len(variants)
+        summaries = [None] * len(variants)
+        if self.cache is not None and not generate_kwargs.get("do_sample"):
+            for i, (max_length, min_length) in enumerate(variants):
+                keys[i] = SummaryCache.make_key(text, self.model_id, **params, max_length=max_length,
+                                                min_length=min_length)
+                summaries[i] = self.cache.get(keys[i])
+
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        if missing:
+            with metrics.TOKENIZE_SECONDS.time():
+                inputs = self.tokenization.thread_tokenizer()(
+                    [text], max_length=max_input_length, truncation=True, return_tensors="pt"
+                ).to(self.device)
+            hidden = self._encode(inputs) if self.reuses_encoder else None
+            for i in missing:
+                max_length, min_length = variants[i]
+                summaries[i] = self._generate(inputs, max_length, min_length, encoder_hidden=hidden,
+                                              **generate_kwargs)[0]
+                if keys[i] is not None:
+                    self.cache.put(keys[i], summaries[i])
+        return summaries
+
+    def _encode(self, inputs):
+        # Encoder hidden states for a padded batch, running the encoder only
+        # for sequences not already in the encoder cache
+        input_ids, attention_mask = inputs["input_ids"], inputs["attention_mask"]
+        lengths = attention_mask.sum(dim=1).tolist()
+        keys = [None] * len(lengths)
+        states = [None] * len(lengths)
+        if self.encoder_cache is not None:
+            for i, length in enumerate(lengths):
+                keys[i] = EncoderCache.make_key(self.model_id, input_ids[i, :length].tolist())
+                states[i] = self.encoder_cache.get(keys[i])
+
+        missing = [i for i, state in enumerate(states) if state is None]
+        if missing:
+            width = max(lengths[i] for i in missing)
+            with torch.no_grad(), metrics.ENCODE_SECONDS.time():
+                hidden = self.model.get_encoder()(
+                    input_ids=input_ids[missing, :width],
+                    attention_mask=attention_mask[missing, :width],
+                    return_dict=True
+                ).last_hidden_state
+            for row, i in enumerate(missing):
+                states[i] = hidden[row, :lengths[i]]
+                if keys[i] is not None:
+                    self.encoder_cache.put(keys[i], states[i])
+        if len(missing) == len(states) and width == input_ids.shape[1]:
+            return hidden
+
+        # Padded positions are masked out of cross-attention, so zeros will do
+        batch = states[0].new_zeros((len(states), input_ids.shape[1], states[0].shape[-1]))
+        for i, state in enumerate(states):
+            batch[i, :state.shape[0]] = state
+        return batch
+
+    def _encoder_kwargs(self, inputs, encoder_hidden=None):
+        if encoder_hidden is None:
+            if not self.reuses_encoder or self.encoder_cache is None:
+                return {}
+            encoder_hidden = self._encode(inputs)
+        # A new wrapper per call: generate() expands it in place for beam search
+        return {"encoder_outputs": BaseModelOutput(last_hidden_state=encoder_hidden)}
+
+    def _summarize_uncached(self, texts, batch_size, max_length, min_length, max_input_length, input_ids=None,
+                            **generate_kwargs):
+        if not texts:
+            return []
+        if input_ids is None:
+            # Tokenize once without padding; summarize_token_ids groups by length
+            with metrics.TOKENIZE_SECONDS.time():
+                input_ids = self.tokenization.encode(texts, max_length=max_input_length, truncation=True)["input_ids"]
+        return self.summarize_token_ids(input_ids, batch_size, max_length, min_length, **generate_kwargs)
+
+    def summarize_token_ids(self, input_ids, batch_size=16, max_length=128, min_length=30, **generate_kwargs):
+        # Pre-tokenized inputs (e.g. from the tokenized dataset store). Inputs of
+        # similar length are grouped so each chunk only pads to its own longest.
+        order = sorted(range(len(input_ids)), key=lambda i: len(input_ids[i]))
+        summaries = [None] * len(input_ids)
+        for start in range(0, len(order), batch_size):
+            chunk = order[start:start + batch_size]
+            inputs = self.tokenization.thread_tokenizer().pad(
+                {"input_ids": [list(input_ids[i]) for i in chunk]}, return_tensors="pt"
+            )
+            for i, summary in zip(chunk, self._generate(inputs, max_length, min_length, **generate_kwargs)):
+                summaries[i] = summary
+        return summaries
+
+    def _generate(self, inputs, max_length, min_length, num_beams=4, early_stopping=True, encoder_hidden=None,
+                  **generate_kwargs):
+        inputs = inputs.to(self.device)
+        if min_length is not None:
+            generate_kwargs["min_length"] = min_length
+        metrics.BATCH_SIZE.observe(inputs["input_ids"].shape[0], stage="generate")
+        for length in inputs["attention_mask"].sum(dim=1).tolist():
+            metrics.INPUT_TOKENS.observe(length)
+        generate_kwargs.update(self._encoder_kwargs(inputs, encoder_hidden))
+        with torch.no_grad(), metrics.GENERATE_SECONDS.time(mode="batch"):
+            summary_ids = self.model.generate(
+                inputs["input_ids"],
+                attention_mask=inputs["attention_mask"],
+                num_beams=num_beams,
+                max_length=max_length,
+                early_stopping=early_stopping,
+                **generate_kwargs
+            )
+        pad_token_id = self.tokenizer.pad_token_id
+        if pad_token_id is not None:
+            for length in (summary_ids != pad_token_id).sum(dim=1).tolist():
+                metrics.OUTPUT_TOKENS.observe(length)
+        with metrics.DECODE_SECONDS.time():
+            return self.tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
@@ -0,0 +1,183 @@
+# src/summarizer/components/model_registry.py
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from src.summarizer.components.model_loader import ModelLoader, ModelNotReadyError
+from src.summarizer.logging import logger
+
+
+class UnknownModelError(Exception):
+    pass
+
+
+# Several named checkpoints behind one interface. Each model has its own
+# ModelLoader: the default one follows serving.load_mode, the others load
+# lazily on first use. Loaded models are kept in least-recently-used order
+# and evicted (the default excepted) while their combined size is over the
+# memory budget. A watcher thread hot-swaps any local model whose files
+# change on disk, e.g. a retrained artifacts/model.
+class ModelRegistry:
+    def __init__(self, specs, factory, default_model, load_mode="background", warmup_requests=0,
+                 memory_budget_mb=0, started_at=None):
+        if default_model not in specs:
+            raise ValueError(f"Default model '{default_model}' is not among the configured models {list(specs)}")
+        self.specs = specs
+        self.default_model = default_model
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.loaders = {
+            name: ModelLoader(
+                lambda spec=spec: factory(spec),
+                mode=load_mode if name == default_model else "lazy",
+                warmup_requests=warmup_requests,
+                started_at=started_at
+            )
+            for name, spec in specs.items()
+        }
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop = threading.Event()
+        self._seen = None  # model -> identity last loaded, for the watcher
+        self._candidate = {}
+        self._reload_handler = None
+
+    # ---------- lookup ----------
+    def loader(self, name=None):
+        name = name or self.default_model
+        if name not in self.loaders:
+            raise UnknownModelError(f"Unknown model '{name}', available: {', '.join(self.loaders)}")
+        return self.loaders[name]
+
+    def get(self, name=None, wait=None):
+        name = name or self.default_model
+        predictor = self.loader(name).get(wait=wait)
+        self._touch(name)
+        return predictor
+
+    async def aget(self, name=None):
+        name = name or self.default_model
+        predictor = await self.loader(name).aget()
+        self._touch(name)
+        return predictor
+
+    def start(self):
+        self.loader().start()
+
+    # ---------- memory budget ----------
+    def _touch(self, name):
+        with self._lock:
+            is_new = name not in self._recent
+            self._recent[name] = time.monotonic()
+            self._recent.move_to_end(name)
+        if is_new and self.memory_budget:
+            self._enforce_budget(keep=name)
+
+    def _resident(self):
+        sizes = {}
+        for name, loader in self.loaders.items():
+            if loader.is_ready():
+                try:
+                    sizes[name] = loader.get(wait=False).memory_bytes()
+                except ModelNotReadyError:
+                    pass
+        return sizes
+
+    def _enforce_budget(self, keep):
+        sizes = self._resident()
+        total = sum(sizes.values())
+        with self._lock:
+            candidates = [name for name in self._recent if name not in (keep, self.default_model)]
+        for name in candidates:
+            if total <= self.memory_budget:
+                break
+            if name in sizes and self.loaders[name].unload():
+                total -= sizes[name]
+                with self._lock:
+                    self._recent.pop(name, None)
+                logger.info(f"Evicted model '{name}' ({sizes[name] / 2**20:.0f} MB) to stay within the memory budget")
+        if total > self.memory_budget:
+            logger.warning(
+                f"Resident models use {total / 2**20:.0f} MB, over the {self.memory_budget / 2**20:.0f} MB budget"
+            )
+
+    # ---------- hot swap ----------
+    def delegate_reloads(self, handler):
+        # Prefork workers hand reloads to the master, which reloads once and
+        # re-forks them so the new weights are shared again: reload() calls
+        # handler(name) instead, and this process does not watch the files
+        self._reload_handler = handler
+
+    def reload(self, name=None):
+        if self._reload_handler is not None:
+            self.loader(name)  # raises UnknownModelError
+            self._reload_handler(name or self.default_model)
+            return True
+        return self.loader(name).reload()
+
+    def _identity(self, name):
+        from src.summarizer.components.model_prediction import ModelPrediction
+
+        spec = self.specs[name]
+        path = spec.onnx_dir if spec.backend == "onnx" else spec.model_path
+        if not path or not os.path.isdir(path):
+            return None
+        return ModelPrediction._model_identity(path, spec.backend)
+
+    def start_watching(self, interval_seconds):
+        if interval_seconds <= 0 or self._watcher is not None or self._reload_handler is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, args=(interval_seconds,), name="model-watcher",
+                                         daemon=True)
+        self._watcher.start()
+
+    def changed_models(self):
+        # One watcher poll; the first only records the current files. A change
+        # must look the same on two consecutive polls before it is reported,
+        # so a checkpoint that is still being written is not picked up.
+        if self._seen is None:
+            self._seen = {name: self._identity(name) for name in self.loaders}
+            return []
+        changed = []
+        for name in self.loaders:
+            current = self._identity(name)
+            if current is None or current == self._seen[name]:
+                self._candidate.pop(name, None)
+                continue
+            if self._candidate.get(name) != current:
+                self._candidate[name] = current
+                continue
+            self._seen[name] = current
+            self._candidate.pop(name, None)
+            changed.append(name)
+        return changed
+
+    def _watch(self, interval_seconds):
+        self.changed_models()
+        while not self._stop.wait(interval_seconds):
+            for name in self.changed_models():
+                loader = self.loaders[name]
+                if loader.is_ready():
+                    logger.info(f"Model '{name}' changed on disk, hot-swapping")
+                    loader.reload()
+
+    def stop(self):
+        self._stop.set()
+
+    def status(self):
+        sizes = self._resident()
+        return {
+            "default": self.default_model,
+            "memory_budget_mb": round(self.memory_budget / 2**20, 1),
+            "resident_mb": round(sum(sizes.values()) / 2**20, 1),
+            "models": {
+                name: {
+                    "model_path": self.specs[name].model_path,
+                    "backend": self.specs[name].backend,
+                    "memory_mb": round(sizes[name] / 2**20, 1) if name in sizes else None,
+                    **loader.status(),
+                }
+                for name, loader in self.loaders.items()
+            },
+        }
@@ -1,66 +1,82 @@
-import pandas as pd
 from datasets import Dataset
 from transformers import (
-    AutoTokenizer,
     AutoModelForSeq2SeqLM,
     DataCollatorForSeq2Seq,
     Trainer,
     TrainingArguments
 )
 import torch
-import os
+from torch.utils.data import DataLoader
+from src.summarizer.components.batch_sampling import TokenBudgetBatchSampler
+from src.summarizer.components.data_transformation import read_split
+from src.summarizer.components.tokenized_store import TokenizedDatasetStore, tokenize_examples
+from src.summarizer.components.tokenization import load_tokenizer
+
+
+class TokenBudgetTrainer(Trainer):
+    # Trainer whose training batches are sized by a token budget instead of a
+    # fixed example count; padding is left to the collator, per batch
+    def __init__(self, *args, max_tokens_per_batch=4096, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_tokens_per_batch = max_tokens_per_batch
+
+    def get_train_dataloader(self) -> DataLoader:
+        train_dataset = self._remove_unused_columns(self.train_dataset, description="Training")
+        lengths = [
+            len(input_ids) + len(labels)
+            for input_ids, labels in zip(train_dataset["input_ids"], train_dataset["labels"])
+        ]
+        batch_sampler = TokenBudgetBatchSampler(lengths, self.max_tokens_per_batch, seed=self.args.seed)
+        return self.accelerator.prepare(DataLoader(
+            train_dataset,
+            batch_sampler=batch_sampler,
+            collate_fn=self.data_collator,
+            num_workers=self.args.dataloader_num_workers,
+            pin_memory=self.args.dataloader_pin_memory,
+        ))
 
 
 class ModelTrainer:
-    def __init__(self, config):
+    def __init__(self, config, tokenization_config=None):
         self.config = config
+        self.tokenization_config = tokenization_config
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         print(f"Using device: {self.device}")
 
-        # If trained model already exists, load it
-        if os.path.exists(config.output_dir) and os.listdir(config.output_dir):
-            print(f"✅ Found existing model at {config.output_dir}, loading instead of retraining...")
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(config.output_dir).to(self.device)
-            self.tokenizer = AutoTokenizer.from_pretrained(config.output_dir)
-        else:
-            # Load fresh model + tokenizer
-            self.model = AutoModelForSeq2SeqLM.from_pretrained(config.model_ckpt).to(self.device)
-            if self.device == "cuda":
-                self.model.gradient_checkpointing_enable()
-            self.tokenizer = AutoTokenizer.from_pretrained(config.tokenizer_name)
+        # Always start from the base checkpoint. Whether training is needed at
+        # all is decided by the stage runner in main.py, which compares the
+        # config, params and data against its manifest.
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(config.model_ckpt).to(self.device)
+        if self.device == "cuda":
+            self.model.gradient_checkpointing_enable()
+        self.tokenizer = load_tokenizer(config.tokenizer_name)
 
     def load_dataset(self, path: str) -> Dataset:
-        df = pd.read_csv(path)
+        df = read_split(path)
         df["dialogue"] = df["dialogue"].astype(str).fillna("")
         df["summary"] = df["summary"].astype(str).fillna("")
         return Dataset.from_pandas(df)
 
     def tokenize_function(self, examples: dict) -> dict:
-        inputs = self.tokenizer(
-            examples["dialogue"],
-            max_length=128,
-            truncation=True,
-            padding="max_length"
-        )
-        targets = self.tokenizer(
-            examples["summary"],
-            max_length=32,
-            truncation=True,
-            padding="max_length"
-        )
-        inputs["labels"] = targets["input_ids"]
-        return inputs
-
-    def train(self, train_path: str, eval_path: str):
-        # If model already trained, skip training
-        if os.path.exists(self.config.output_dir) and os.listdir(self.config.output_dir):
-            print(f"⚡ Skipping training since model already exists at {self.config.output_dir}")
-            return
+        # In length-efficient mode padding is deferred to the collator, which
+        # pads each batch only up to its own longest example
+        padding = False if self.config.length_efficient else "max_length"
+        return tokenize_examples(examples, self.tokenizer, max_input_length=128, max_target_length=32,
+                                 padding=padding)
 
-        if self.device == "cuda":
-            torch.cuda.empty_cache()
+    def load_tokenized(self, train_path: str, eval_path: str):
+        if self.tokenization_config is not None:
+            # Shared Arrow store: tokenized once, memory-mapped on every later run
+            store = TokenizedDatasetStore(
+                self.tokenization_config.root_dir,
+                self.tokenizer,
+                max_input_length=self.tokenization_config.max_input_length,
+                max_target_length=self.tokenization_config.max_target_length,
+                padding=False if self.config.length_efficient else "max_length",
+                num_proc=self.tokenization_config.num_proc
+            )
+            return store.load("train", train_path), store.load("eval", eval_path)
 
-        # Load and tokenize datasets
         train_dataset = self.load_dataset(train_path).map(
             self.tokenize_function,
             batched=True,
@@ -71,14 +87,31 @@ class ModelTrainer:
             batched=True,
             remove_columns=["dialogue", "summary"]
         )
+        return train_dataset, eval_dataset
+
+    def train(self, train_path: str, eval_path: str):
+        if self.device == "cuda":
+            torch.cuda.empty_cache()
+
+        # Load and tokenize datasets
+        train_dataset, eval_dataset = self.load_tokenized(train_path, eval_path)
 
         data_collator = DataCollatorForSeq2Seq(self.tokenizer, model=self.model)
 
+        if self.config.length_efficient:
+            # Batches are bounded by tokens (or grouped by length), not clamped to one example
+            train_batch_size = self.config.per_device_train_batch_size
+            eval_batch_size = self.config.per_device_eval_batch_size
+        else:
+            train_batch_size = min(self.config.per_device_train_batch_size, 1)
+            eval_batch_size = min(self.config.per_device_eval_batch_size, 1)
+
         args = TrainingArguments(
             output_dir=self.config.output_dir,
             num_train_epochs=self.config.num_train_epochs,
-            per_device_train_batch_size=min(self.config.per_device_train_batch_size, 1),
-            per_device_eval_batch_size=min(self.config.per_device_eval_batch_size, 1),
+            per_device_train_batch_size=train_batch_size,
+            per_device_eval_batch_size=eval_batch_size,
+            group_by_length=self.config.length_efficient,
             learning_rate=self.config.learning_rate,
             weight_decay=self.config.weight_decay,
             logging_steps=self.config.logging_steps,
@@ -91,7 +124,7 @@ class ModelTrainer:
             no_cuda=False,
         )
 
-        trainer = Trainer(
+        trainer_kwargs = dict(
             model=self.model,
             args=args,
             train_dataset=train_dataset,
@@ -99,6 +132,10 @@ class ModelTrainer:
             tokenizer=self.tokenizer,
             data_collator=data_collator,
         )
+        if self.config.length_efficient and self.config.max_tokens_per_batch:
+            trainer = TokenBudgetTrainer(max_tokens_per_batch=self.config.max_tokens_per_batch, **trainer_kwargs)
+        else:
+            trainer = Trainer(**trainer_kwargs)
 
         # Start training
         trainer.train()
@@ -0,0 +1,172 @@
+# src/summarizer/components/near_dedup.py
+import hashlib
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.summarizer.components import metrics
+
+# Timestamps that differ between otherwise identical ticket exports: a stamp
+# at the start of a line (per-turn metadata) and full ISO datetimes. Dates and
+# times elsewhere in a turn are content ("meet at 10:30") and are kept.
+_DATE = r"(?:\d{4}-\d{2}-\d{2}|\d{1,2}/\d{1,2}/\d{2,4})"
+_TIME = r"\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:\s*(?:am|pm)\b)?"
+_LINE_STAMP = re.compile(rf"^[ \t]*[\[(]?(?:{_DATE}(?:[ \t,t]+{_TIME})?|{_TIME})[\])]?", re.MULTILINE)
+_ISO_DATETIME = re.compile(r"\b\d{4}-\d{2}-\d{2}t\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:z|[+-]\d{2}:?\d{2})?\b")
+_NON_WORD = re.compile(r"[^\w]+")
+
+# Universal hashing for the MinHash permutations, (a * x + b) mod p. With
+# 32-bit shingle hashes and a < 2**31 the product stays inside uint64.
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def normalize_text(text):
+    # Case, timestamps, punctuation and whitespace do not change what a
+    # dialogue says, so they do not count as differences
+    text = _LINE_STAMP.sub(" ", str(text).lower())
+    text = _ISO_DATETIME.sub(" ", text)
+    return " ".join(_NON_WORD.sub(" ", text).split())
+
+
+def _hash32(value):
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest(), "little")
+
+
+# Assigns each text to a cluster: first by exact match of its normalized form,
+# then by MinHash over word shingles, with locality-sensitive hashing (bands
+# of the signature) to find candidate clusters without comparing against all
+# of them. A candidate only counts if the estimated Jaccard similarity to the
+# cluster's first text reaches the threshold.
+class NearDuplicateIndex:
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=3, seed=1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = max(int(shingle_size), 1)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._exact = {}  # normalized text digest -> cluster
+        self._buckets = [{} for _ in range(bands)]  # band hash -> [clusters]
+        self._signatures = []  # per cluster, signature of its first text
+        self.exact_duplicates = 0
+        self.near_duplicates = 0
+
+    def signature(self, normalized):
+        words = normalized.split()
+        size = self.shingle_size
+        shingles = {" ".join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        hashes = np.fromiter((_hash32(s) for s in shingles), dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0)
+
+    def add(self, text):
+        normalized = normalize_text(text)
+        digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).digest()
+        cluster = self._exact.get(digest)
+        if cluster is not None:
+            self.exact_duplicates += 1
+            return cluster
+
+        signature = self.signature(normalized)
+        band_keys = [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+        if self.threshold < 1.0:
+            candidates = {c for band, key in enumerate(band_keys) for c in self._buckets[band].get(key, ())}
+            best, best_similarity = None, self.threshold
+            for candidate in candidates:
+                similarity = float(np.mean(self._signatures[candidate] == signature))
+                if similarity >= best_similarity:
+                    best, best_similarity = candidate, similarity
+            if best is not None:
+                self._exact[digest] = best
+                self.near_duplicates += 1
+                return best
+
+        cluster = len(self._signatures)
+        self._signatures.append(signature)
+        self._exact[digest] = cluster
+        for band, key in enumerate(band_keys):
+            self._buckets[band].setdefault(key, []).append(cluster)
+        return cluster
+
+
+@dataclass
+class DedupPlan:
+    clusters: list  # cluster id per row
+    last_row: dict  # cluster id -> last row that belongs to it
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+
+    @property
+    def rows(self):
+        return len(self.clusters)
+
+    @property
+    def unique(self):
+        return len(self.last_row)
+
+    def stats(self):
+        return {"rows": self.rows, "unique": self.unique, "exact_duplicates": self.exact_duplicates,
+                "near_duplicates": self.near_duplicates}
+
+
+def plan_clusters(texts, threshold=0.8, num_perm=64, bands=16, shingle_size=3):
+    # One pass over the texts (any iterable, e.g. a CSV column read lazily);
+    # only one signature per cluster is kept in memory
+    index = NearDuplicateIndex(threshold, num_perm, bands, shingle_size)
+    clusters, last_row = [], {}
+    for row, text in enumerate(texts):
+        cluster = index.add(text)
+        clusters.append(cluster)
+        last_row[cluster] = row
+    return DedupPlan(clusters, last_row, index.exact_duplicates, index.near_duplicates)
+
+
+# Wraps a summarize_chunk(texts) callable so that each cluster is summarized
+# once and its summary reused for every row of the cluster, including rows in
+# later chunks. Chunks must be passed in row order, starting at start_row.
+# Summaries are dropped once a cluster's last row has been served.
+class ClusterSummarizer:
+    def __init__(self, plan, summarize_chunk, start_row=0):
+        self.plan = plan
+        self.summarize_chunk = summarize_chunk
+        self.start_row = start_row
+        self.generations = 0
+        self._row = start_row
+        self._summaries = {}
+
+    @property
+    def rows_served(self):
+        return self._row - self.start_row
+
+    @property
+    def generations_saved(self):
+        return self.rows_served - self.generations
+
+    def __call__(self, texts):
+        rows = range(self._row, self._row + len(texts))
+        clusters = [self.plan.clusters[row] for row in rows]
+
+        # Generate for the first row of each cluster whose summary is not
+        # known yet (after a resume that may be a later row of the cluster)
+        pending = {}
+        for text, cluster in zip(texts, clusters):
+            if cluster not in self._summaries and cluster not in pending:
+                pending[cluster] = text
+        if pending:
+            for cluster, summary in zip(pending, self.summarize_chunk(list(pending.values()))):
+                self._summaries[cluster] = summary
+            self.generations += len(pending)
+        metrics.DEDUP_GENERATIONS_SAVED.inc(len(texts) - len(pending))
+
+        summaries = [self._summaries[cluster] for cluster in clusters]
+        for row, cluster in zip(rows, clusters):
+            if self.plan.last_row[cluster] <= row:
+                self._summaries.pop(cluster, None)
+        self._row += len(texts)
+        return summaries
@@ -0,0 +1,245 @@
+# src/summarizer/components/prefork_server.py
+import gc
+import importlib
+import os
+import signal
+import socket
+import time
+
+from src.summarizer.logging import logger, setup_logging
+
+# A worker that dies sooner than this after being forked counts as a crash
+# loop; the master then waits before forking it again
+MIN_WORKER_UPTIME_SECONDS = 5
+RESPAWN_BACKOFF_SECONDS = 2
+SHUTDOWN_TIMEOUT_SECONDS = 30
+
+
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_workers(num_cpus, workers=0, threads_per_worker=0, inference_workers=1):
+    # Splits the cores between processes and their torch thread pools so that
+    # workers * inference_workers * threads stays close to the core count
+    # instead of every process starting one intra-op thread per core
+    inference_workers = max(1, inference_workers)
+    if workers <= 0:
+        workers = max(1, num_cpus // (max(1, threads_per_worker) * inference_workers))
+    if threads_per_worker <= 0:
+        threads_per_worker = max(1, num_cpus // (workers * inference_workers))
+    return workers, threads_per_worker
+
+
+# Pre-fork serving: the master loads the default model once, then forks the
+# workers, which inherit its weights copy-on-write. Tensor storage is never
+# written while serving, so those pages stay shared and N workers cost about
+# one copy of the weights plus per-process overhead. gc.freeze() keeps the
+# collector from touching (and so copying) the inherited objects. Workers
+# accept on one shared listening socket and are re-forked if they die.
+#
+# Reloads go through the master too, so the sharing survives them: the master
+# watches the model files (serving.watch_interval_seconds) and takes SIGHUP,
+# which workers send for /api/models/{name}/reload. It then reloads the
+# default model and replaces every worker with a fresh fork. Other models are
+# loaded lazily and privately by each worker, as before.
+class PreforkServer:
+    def __init__(self, app_module, host, port, workers=1, threads_per_worker=0, inference_workers=1,
+                 pin_cpus=False, watch_interval_seconds=0):
+        # app_module: import path of the module defining `app` and
+        # `model_registry`, imported once the thread limits are in place
+        self.app_module = app_module
+        self.host = host
+        self.port = port
+        self.cpus = available_cpus()
+        self.workers, self.threads_per_worker = plan_workers(
+            len(self.cpus), workers, threads_per_worker, inference_workers
+        )
+        self.pin_cpus = pin_cpus
+        self.watch_interval_seconds = watch_interval_seconds
+        self._app = None
+        self._children = {}  # pid -> (worker index, fork time)
+        self._retiring = set()  # pids replaced after a reload, not to be respawned
+        self._stopping = False
+        self._reload_requested = False
+        self._listener = None
+
+    def _import_app(self):
+        # OpenMP and MKL read these when torch loads them, so they have to be
+        # set before anything imports torch; torch.set_num_threads() later
+        # only resizes torch's own pool
+        os.environ["OMP_NUM_THREADS"] = os.environ["MKL_NUM_THREADS"] = str(self.threads_per_worker)
+        self._app = importlib.import_module(self.app_module)
+        return self._app
+
+    # ---------- master ----------
+    def _load_default(self, reload=False):
+        # Load without warmup: running generate here would start torch's
+        # thread pools in the master, which do not survive a fork. Each worker
+        # warms up its own after forking.
+        loader = self._app.model_registry.loader()
+        warmup_requests, loader.warmup_requests = loader.warmup_requests, 0
+        try:
+            if reload:
+                if not loader.reload():
+                    return False
+            else:
+                loader.load()
+        finally:
+            loader.warmup_requests = warmup_requests
+        if not loader.is_ready():
+            raise RuntimeError(f"Could not preload the default model: {loader.status().get('error')}")
+        predictor = loader.get(wait=False)
+        logger.info(f"{'Reloaded' if reload else 'Preloaded'} the default model "
+                    f"({predictor.memory_bytes() / 2**20:.0f} MB) for {self.workers} workers")
+        return True
+
+    def _bind(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn(self, index, sock):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+                    signal.signal(signum, signal.SIG_DFL)
+                self._worker(index, sock)
+                code = 0
+            except Exception:
+                logger.exception(f"Worker {index} failed")
+            finally:
+                if self._listener is not None:
+                    self._listener.stop()
+                os._exit(code)
+        self._children[pid] = (index, time.monotonic())
+        logger.info(f"Started worker {index} (pid {pid})")
+
+    def _terminate(self, pid):
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _signal_children(self, signum, frame=None):
+        self._stopping = True
+        for pid in list(self._children):
+            self._terminate(pid)
+
+    def _request_reload(self, signum=None, frame=None):
+        self._reload_requested = True
+
+    def _reload(self, sock):
+        # Reload in the master, then fork a replacement for every worker and
+        # let the old ones finish their requests; until the new ones are warm,
+        # connections wait in the shared listen backlog
+        self._reload_requested = False
+        gc.unfreeze()
+        if not self._load_default(reload=True):
+            logger.warning("Reload failed, keeping the current workers")
+            gc.freeze()
+            return
+        gc.collect()
+        gc.freeze()
+        for pid, (index, _) in list(self._children.items()):
+            if pid in self._retiring:
+                continue
+            self._spawn(index, sock)
+            self._retiring.add(pid)
+            self._terminate(pid)
+
+    def _poll_model_files(self, next_poll):
+        if not self.watch_interval_seconds or time.monotonic() < next_poll:
+            return next_poll
+        changed = self._app.model_registry.changed_models()
+        if changed:
+            logger.info(f"Model files changed on disk ({', '.join(changed)}), reloading the workers")
+            self._reload_requested = True
+        return time.monotonic() + self.watch_interval_seconds
+
+    def run(self):
+        os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+        self._import_app()
+        self._load_default()
+        sock = self._bind()
+        logger.info(f"Serving on http://{self.host}:{self.port} with {self.workers} workers x "
+                    f"{self.threads_per_worker} threads over {len(self.cpus)} cores")
+        master_pid = os.getpid()
+        self._app.model_registry.delegate_reloads(lambda name: os.kill(master_pid, signal.SIGHUP))
+        next_poll = self._poll_model_files(0)
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._signal_children)
+        signal.signal(signal.SIGINT, self._signal_children)
+        signal.signal(signal.SIGHUP, self._request_reload)
+        for index in range(self.workers):
+            self._spawn(index, sock)
+
+        deadline = None
+        while self._children:
+            if self._reload_requested and not self._stopping:
+                self._reload(sock)
+            next_poll = self._poll_model_files(next_poll)
+            if self._stopping and deadline is None:
+                deadline = time.monotonic() + SHUTDOWN_TIMEOUT_SECONDS
+            if deadline is not None and time.monotonic() > deadline:
+                for pid in list(self._children):
+                    logger.warning(f"Worker pid {pid} did not stop in time, killing it")
+                    os.kill(pid, signal.SIGKILL)
+                deadline = float("inf")
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.2)
+                continue
+            index, started = self._children.pop(pid)
+            if self._stopping or pid in self._retiring:
+                self._retiring.discard(pid)
+                continue
+            logger.warning(f"Worker {index} (pid {pid}) exited with status {os.waitstatus_to_exitcode(status)}, "
+                           f"restarting it")
+            if time.monotonic() - started < MIN_WORKER_UPTIME_SECONDS:
+                time.sleep(RESPAWN_BACKOFF_SECONDS)
+            self._spawn(index, sock)
+        sock.close()
+        logger.info("All workers stopped")
+
+    # ---------- worker ----------
+    def _worker(self, index, sock):
+        import torch
+        import uvicorn
+
+        # The log listener thread stayed behind in the master; start a fresh
+        # one writing to this worker's own file
+        self._listener = setup_logging(file_suffix=f".worker{index}")
+        if self.pin_cpus and hasattr(os, "sched_setaffinity"):
+            share = max(1, len(self.cpus) // self.workers)
+            cpus = self.cpus[index * share:(index + 1) * share] or self.cpus
+            os.sched_setaffinity(0, cpus)
+        torch.set_num_threads(self.threads_per_worker)
+
+        self._app.model_registry.loader().warmup()
+        logger.info(f"Worker {index} ready (pid {os.getpid()}, {self.threads_per_worker} torch threads)")
+
+        config = uvicorn.Config(self._app.app, log_config=None, access_log=False)
+        uvicorn.Server(config).run(sockets=[sock])
+
+    # ---------- single process ----------
+    def run_single(self):
+        self._import_app()
+        import torch
+        import uvicorn
+
+        torch.set_num_threads(self.threads_per_worker)
+        logger.info(f"Serving on http://{self.host}:{self.port} in one process with "
+                    f"{self.threads_per_worker} torch threads")
+        uvicorn.run(self._app.app, host=self.host, port=self.port, log_config=None, access_log=False)
@@ -0,0 +1,48 @@
+# src/summarizer/components/request_logging.py
+import re
+import time
+import uuid
+
+from src.summarizer.logging import request_id_var, request_logger
+
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+# Gives every HTTP request an id (the caller's X-Request-ID when it is sane,
+# otherwise a new one), exposes it to log records through request_id_var,
+# echoes it back in the response and writes one sampled access-log record
+# with the status and duration once the response body has been sent.
+class RequestLoggingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        incoming = headers.get(b"x-request-id", b"").decode("latin-1")
+        request_id = incoming if _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = round((time.perf_counter() - started) * 1000, 2)
+            request_logger.info(
+                f"{scope['method']} {scope['path']} {status['code']} {duration_ms}ms",
+                extra={"method": scope["method"], "path": scope["path"], "status": status["code"],
+                       "duration_ms": duration_ms},
+            )
+            request_id_var.reset(token)
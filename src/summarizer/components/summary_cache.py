@@ -0,0 +1,108 @@
+# src/summarizer/components/summary_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from src.summarizer.logging import logger
+
+
+# Content-addressed summary cache: an in-memory LRU tier bounded by entry
+# count and bytes, backed by an optional sqlite file that survives restarts.
+# The sqlite connection is opened per process on first use: a connection
+# must not be carried across fork(), and prefork workers share the file.
+class SummaryCache:
+    def __init__(self, max_entries=10000, max_bytes=64 * 1024 * 1024, disk_path=None):
+        self.max_entries = max(int(max_entries), 1)
+        self.max_bytes = max(int(max_bytes), 1)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.disk_path = disk_path
+        self._db = None
+        self._db_pid = None
+        if disk_path:
+            os.makedirs(os.path.dirname(disk_path) or ".", exist_ok=True)
+            db = sqlite3.connect(disk_path)
+            try:
+                db.execute("CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, summary TEXT NOT NULL)")
+                db.commit()
+            finally:
+                db.close()
+            logger.info(f"Summary cache disk tier at {disk_path}")
+
+    def _connection(self):
+        # Called with the lock held. A connection inherited from a parent
+        # process is left alone rather than closed, as SQLite advises.
+        if self.disk_path is None:
+            return None
+        if self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.disk_path, timeout=30, check_same_thread=False)
+            self._db_pid = os.getpid()
+        return self._db
+
+    @staticmethod
+    def make_key(text, model_id, **params):
+        normalized = " ".join(str(text).split())
+        payload = json.dumps({"model": model_id, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256((payload + "\0" + normalized).encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self._lock:
+            summary = self._entries.get(key)
+            if summary is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return summary
+            db = self._connection()
+            if db is not None:
+                row = db.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._store(key, row[0])
+                    return row[0]
+            self.misses += 1
+            return None
+
+    def put(self, key, summary):
+        with self._lock:
+            self._store(key, summary)
+            db = self._connection()
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO summaries (key, summary) VALUES (?, ?)", (key, summary))
+                db.commit()
+
+    def _store(self, key, summary):
+        if key in self._entries:
+            self._bytes -= self._entry_size(key, self._entries.pop(key))
+        size = self._entry_size(key, summary)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = summary
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            old_key, old_summary = self._entries.popitem(last=False)
+            self._bytes -= self._entry_size(old_key, old_summary)
+
+    @staticmethod
+    def _entry_size(key, summary):
+        return len(key) + len(summary.encode("utf-8"))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
@@ -0,0 +1,61 @@
+# src/summarizer/components/tokenization.py
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from transformers import AutoTokenizer
+from src.summarizer.logging import logger
+
+
+def load_tokenizer(name_or_path, require_fast=False):
+    # Always asks for the Rust ("fast") implementation; transformers converts
+    # sentencepiece and other slow vocabularies when it can. A slow tokenizer
+    # is an error with require_fast, otherwise a warning.
+    tokenizer = AutoTokenizer.from_pretrained(name_or_path, use_fast=True)
+    if not tokenizer.is_fast:
+        message = f"No fast tokenizer available for {name_or_path}; tokenization will run in Python"
+        if require_fast:
+            raise ValueError(message)
+        logger.warning(message)
+    return tokenizer
+
+
+# Batch encoding off the calling thread. Fast tokenizers release the GIL while
+# encoding, so a large batch split into shards is encoded in parallel on the
+# pool, independent of TOKENIZERS_PARALLELISM (which is off after a fork).
+# Every thread encodes with its own copy of the tokenizer: transformers
+# reconfigures truncation and padding on the Rust object per call, and two
+# threads doing that to a shared one fail with "Already borrowed". The shared
+# tokenizer is then only ever read (decoding, special token ids).
+class TokenizationService:
+    def __init__(self, tokenizer, num_threads=4, shard_size=64):
+        self.tokenizer = tokenizer
+        self.num_threads = max(int(num_threads), 1)
+        self.shard_size = max(int(shard_size), 1)
+        self._pool = ThreadPoolExecutor(max_workers=self.num_threads, thread_name_prefix="tokenize")
+        self._local = threading.local()
+
+    def thread_tokenizer(self):
+        # The calling thread's copy, for encoding or padding in place
+        tokenizer = getattr(self._local, "tokenizer", None)
+        if tokenizer is None:
+            tokenizer = self._local.tokenizer = copy.deepcopy(self.tokenizer)
+        return tokenizer
+
+    def _encode_on_pool(self, texts, kwargs):
+        return dict(self.thread_tokenizer()(texts, **kwargs))
+
+    def encode(self, texts, **kwargs):
+        # Unpadded encodings as lists, in input order
+        texts = [str(t) for t in texts]
+        if len(texts) <= self.shard_size or self.num_threads == 1 or not self.tokenizer.is_fast:
+            # Not worth a hand-off (or, for a slow tokenizer, not parallel anyway)
+            return self._encode_on_pool(texts, kwargs)
+        shards = [texts[start:start + self.shard_size] for start in range(0, len(texts), self.shard_size)]
+        results = list(self._pool.map(self._encode_on_pool, shards, [kwargs] * len(shards)))
+        return {key: [row for result in results for row in result[key]] for key in results[0]}
+
+    def submit(self, texts, **kwargs):
+        # Encodes on the pool and returns a concurrent.futures.Future, so the
+        # caller can do other work (e.g. wait for a generate slot) meanwhile
+        return self._pool.submit(self._encode_on_pool, [str(t) for t in texts], kwargs)
@@ -0,0 +1,114 @@
+# src/summarizer/components/tokenized_store.py
+import hashlib
+import json
+import os
+import shutil
+from functools import partial
+
+from datasets import Dataset
+from src.summarizer.components.data_transformation import read_split
+from src.summarizer.logging import logger
+
+
+def tokenize_examples(examples, tokenizer, max_input_length=128, max_target_length=32, padding=False):
+    inputs = tokenizer(
+        examples["dialogue"],
+        max_length=max_input_length,
+        truncation=True,
+        padding=padding
+    )
+    targets = tokenizer(
+        examples["summary"],
+        max_length=max_target_length,
+        truncation=True,
+        padding=padding
+    )
+    inputs["labels"] = targets["input_ids"]
+    return inputs
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def tokenizer_fingerprint(tokenizer):
+    digest = hashlib.sha256(type(tokenizer).__name__.encode("utf-8"))
+    if getattr(tokenizer, "is_fast", False):
+        # The serialized Rust tokenizer covers vocab, normalizer and post-processor.
+        # Truncation/padding are per-call state the tokenizer mutates, not identity.
+        state = json.loads(tokenizer.backend_tokenizer.to_str())
+        state.pop("truncation", None)
+        state.pop("padding", None)
+        digest.update(json.dumps(state, sort_keys=True).encode("utf-8"))
+    else:
+        digest.update(json.dumps(tokenizer.get_vocab(), sort_keys=True).encode("utf-8"))
+    digest.update(json.dumps(tokenizer.special_tokens_map, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Tokenized train/val/test splits saved once as Arrow files under root_dir and
+# reloaded memory-mapped (zero-copy) by training and evaluation. Each split is
+# keyed by a fingerprint of the tokenizer, the tokenization settings and the
+# source CSV's content, so any change produces a fresh entry.
+class TokenizedDatasetStore:
+    def __init__(self, root_dir, tokenizer, max_input_length=128, max_target_length=32, padding=False,
+                 num_proc=None):
+        self.root_dir = root_dir
+        self.tokenizer = tokenizer
+        self.max_input_length = max_input_length
+        self.max_target_length = max_target_length
+        self.padding = padding
+        self.num_proc = num_proc if num_proc is not None else 0
+        self._tokenizer_fingerprint = tokenizer_fingerprint(tokenizer)
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def fingerprint(self, source_path, keep_columns=()):
+        payload = {
+            "tokenizer": self._tokenizer_fingerprint,
+            "max_input_length": self.max_input_length,
+            "max_target_length": self.max_target_length,
+            "padding": self.padding,
+            "keep_columns": sorted(keep_columns),
+            "source": file_sha256(source_path),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def load(self, split, source_path, keep_columns=()):
+        path = os.path.join(self.root_dir, f"{split}-{self.fingerprint(source_path, keep_columns)}")
+        if os.path.isdir(path):
+            logger.info(f"Loading tokenized {split} split from {path}")
+            return Dataset.load_from_disk(path)
+
+        logger.info(f"Tokenizing {split} split from {source_path}")
+        df = read_split(source_path)
+        df["dialogue"] = df["dialogue"].astype(str).fillna("")
+        df["summary"] = df["summary"].astype(str).fillna("")
+        dataset = Dataset.from_pandas(df, preserve_index=False)
+
+        num_proc = self.num_proc or os.cpu_count() or 1
+        num_proc = max(1, min(num_proc, len(dataset) // 1000 or 1))
+        dataset = dataset.map(
+            partial(
+                tokenize_examples,
+                tokenizer=self.tokenizer,
+                max_input_length=self.max_input_length,
+                max_target_length=self.max_target_length,
+                padding=self.padding
+            ),
+            batched=True,
+            num_proc=num_proc if num_proc > 1 else None,
+            remove_columns=[c for c in dataset.column_names if c not in keep_columns]
+        )
+
+        # Write next to the final location and rename, so an interrupted run
+        # never leaves a half-written split that looks complete
+        tmp_path = path + ".tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        dataset.save_to_disk(tmp_path)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved tokenized {split} split ({len(dataset)} rows) to {path}")
+        return Dataset.load_from_disk(path)
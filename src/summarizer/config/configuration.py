@@ -2,7 +2,21 @@ from dataclasses import dataclass
 from src.summarizer.entity.dataingestionconfig import (
     DataIngestionConfig,
     DataTransformationConfig,
-    ModelTrainerConfig
+    DataTokenizationConfig,
+    ModelTrainerConfig,
+    ModelEvaluationConfig,
+    ServingConfig,
+    DecodingPolicy,
+    DecodingConfig,
+    ModelSpec,
+    SummaryCacheConfig,
+    TokenizerConfig,
+    EncoderCacheConfig,
+    LongDocumentConfig,
+    BatchJobConfig,
+    DedupConfig,
+    PipelineConfig,
+    BenchmarkConfig
 )
 from src.summarizer.constants import CONFIG_FILE_PATH, PARAMS_FILE_PATH
 from src.summarizer.utils.common import read_yaml, create_directories
@@ -22,7 +36,12 @@ class ConfigurationManager:
             root_dir=config.root_dir,
             source_URL=config.source_URL,
             local_data_file=config.local_data_file,
-            unzip_dir=config.unzip_dir
+            unzip_dir=config.unzip_dir,
+            sha256=config.get("sha256", None),
+            cache_dir=config.get("cache_dir", "artifacts/download_cache"),
+            download_segments=config.get("download_segments", 4),
+            members=list(config.get("members", None) or []),
+            extract_workers=config.get("extract_workers", 4)
         )
 
     def get_data_transformation_config(self) -> DataTransformationConfig:
@@ -31,7 +50,24 @@ class ConfigurationManager:
             root_dir=config.root_dir,
             train_path=config.train_path,
             test_path=config.test_path,
-            val_path=config.val_path
+            val_path=config.val_path,
+            chunk_size=config.get("chunk_size", 50000),
+            num_workers=config.get("num_workers", 3),
+            output_formats=list(config.get("output_formats", ["csv"])),
+            drop_duplicates=config.get("drop_duplicates", True),
+            normalize_whitespace=config.get("normalize_whitespace", True)
+        )
+
+    def get_data_tokenization_config(self) -> DataTokenizationConfig:
+        config = self.config.get("data_tokenization", {})
+        root_dir = config.get("root_dir", "artifacts/data_tokenization")
+        create_directories([root_dir])
+        return DataTokenizationConfig(
+            root_dir=root_dir,
+            tokenizer_name=config.get("tokenizer_name", self.config.training.tokenizer_name),
+            max_input_length=config.get("max_input_length", 128),
+            max_target_length=config.get("max_target_length", 32),
+            num_proc=config.get("num_proc", 0)
         )
 
     def get_model_trainer_config(self) -> ModelTrainerConfig:
@@ -50,5 +86,184 @@ class ConfigurationManager:
             evaluation_strategy=config.get("evaluation_strategy", "epoch"),
             eval_steps=config.get("eval_steps", 100),
             save_steps=config.get("save_steps", 500),
-            gradient_accumulation_steps=config.get("gradient_accumulation_steps", 1)
+            gradient_accumulation_steps=config.get("gradient_accumulation_steps", 1),
+            length_efficient=config.get("length_efficient", False),
+            max_tokens_per_batch=config.get("max_tokens_per_batch", 0)
+        )
+
+    def get_model_evaluation_config(self) -> ModelEvaluationConfig:
+        config = self.config.get("evaluation", {})
+        root_dir = config.get("root_dir", "artifacts/model_evaluation")
+        create_directories([root_dir])
+
+        # A named policy from the `decoding` section, or beam search with the
+        # evaluation section's own num_beams/length_penalty
+        num_beams = config.get("num_beams", 4)
+        length_penalty = config.get("length_penalty", 2.0)
+        policy_name = config.get("decoding_policy", None)
+        if policy_name:
+            policies = self.get_decoding_config().policies
+            if policy_name not in policies:
+                raise ValueError(f"Unknown evaluation.decoding_policy '{policy_name}', "
+                                 f"available: {', '.join(policies)}")
+            decoding = policies[policy_name]
+        else:
+            decoding = DecodingPolicy(name="evaluation", strategy="beam", num_beams=num_beams,
+                                      length_penalty=length_penalty)
+        return ModelEvaluationConfig(
+            root_dir=root_dir,
+            model_path=config.get("model_path", self.config.training.output_dir),
+            data_path=config.get("data_path", "artifacts/data_transformation/val.csv"),
+            predictions_dir=config.get("predictions_dir", root_dir + "/predictions"),
+            num_workers=config.get("num_workers", 1),
+            batch_size=config.get("batch_size", 16),
+            chunk_size=config.get("chunk_size", 64),
+            max_input_length=config.get("max_input_length", 128),
+            max_length=config.get("max_length", 32),
+            num_beams=num_beams,
+            length_penalty=length_penalty,
+            decoding=decoding
+        )
+
+    def get_decoding_config(self) -> DecodingConfig:
+        config = self.config.get("decoding", {})
+        policies = {
+            name: DecodingPolicy(
+                name=name,
+                strategy=spec.get("strategy", "beam"),
+                num_beams=spec.get("num_beams", 4),
+                length_penalty=spec.get("length_penalty", 1.0),
+                top_k=spec.get("top_k", 50),
+                top_p=spec.get("top_p", 1.0),
+                temperature=spec.get("temperature", 1.0),
+                fallback=spec.get("fallback", None)
+            )
+            for name, spec in (config.get("policies") or {}).items()
+        }
+        if not policies:
+            # The previous hard-coded behaviour
+            policies = {"beam4": DecodingPolicy(name="beam4", strategy="beam", num_beams=4)}
+        default_policy = config.get("default_policy", next(iter(policies)))
+        return DecodingConfig(
+            default_policy=default_policy,
+            batch_policy=config.get("batch_policy", default_policy),
+            deep_queue=config.get("deep_queue", 0),
+            long_input_tokens=config.get("long_input_tokens", 0),
+            policies=policies
+        )
+
+    def get_serving_config(self) -> ServingConfig:
+        config = self.config.get("serving", {})
+        model_path = config.get("model_path", "artifacts/model")
+        backend = config.get("backend", "pytorch")
+        onnx_dir = config.get("onnx_dir", "artifacts/model_onnx")
+
+        # The top-level model_path/backend/onnx_dir are the default model;
+        # `models` adds more checkpoints that requests can choose by name
+        default_model = config.get("default_model", "default")
+        models = {default_model: ModelSpec(model_path=model_path, backend=backend, onnx_dir=onnx_dir)}
+        for name, spec in (config.get("models") or {}).items():
+            if name != default_model:
+                models[name] = ModelSpec(
+                    model_path=spec.get("model_path"),
+                    backend=spec.get("backend", "pytorch"),
+                    onnx_dir=spec.get("onnx_dir", None)
+                )
+
+        return ServingConfig(
+            model_path=model_path,
+            backend=backend,
+            onnx_dir=onnx_dir,
+            default_model=default_model,
+            models=models,
+            memory_budget_mb=config.get("memory_budget_mb", 0),
+            watch_interval_seconds=config.get("watch_interval_seconds", 0),
+            load_mode=config.get("load_mode", "background"),
+            warmup_requests=config.get("warmup_requests", 0),
+            max_batch_size=config.get("max_batch_size", 8),
+            max_wait_ms=config.get("max_wait_ms", 10),
+            max_queue_size=config.get("max_queue_size", 64),
+            inference_workers=config.get("inference_workers", 1),
+            max_pending=config.get("max_pending", 16),
+            csv_batch_size=config.get("csv_batch_size", 16),
+            csv_chunk_rows=config.get("csv_chunk_rows", 64),
+            host=config.get("host", "0.0.0.0"),
+            port=config.get("port", 8080),
+            workers=config.get("workers", 1),
+            threads_per_worker=config.get("threads_per_worker", 0),
+            pin_cpus=config.get("pin_cpus", False)
+        )
+
+    def get_tokenizer_config(self) -> TokenizerConfig:
+        config = self.config.get("tokenizer", {})
+        return TokenizerConfig(
+            require_fast=config.get("require_fast", False),
+            num_threads=config.get("num_threads", 4),
+            shard_size=config.get("shard_size", 64)
+        )
+
+    def get_summary_cache_config(self) -> SummaryCacheConfig:
+        config = self.config.get("summary_cache", {})
+        return SummaryCacheConfig(
+            enabled=config.get("enabled", False),
+            max_entries=config.get("max_entries", 10000),
+            max_bytes=config.get("max_bytes", 64 * 1024 * 1024),
+            disk_path=config.get("disk_path", None)
+        )
+
+    def get_encoder_cache_config(self) -> EncoderCacheConfig:
+        config = self.config.get("encoder_cache", {})
+        return EncoderCacheConfig(
+            enabled=config.get("enabled", False),
+            max_entries=config.get("max_entries", 1024),
+            max_bytes=config.get("max_bytes", 256 * 1024 * 1024)
+        )
+
+    def get_long_document_config(self) -> LongDocumentConfig:
+        config = self.config.get("long_document", {})
+        return LongDocumentConfig(
+            chunk_tokens=config.get("chunk_tokens", 512),
+            overlap_tokens=config.get("overlap_tokens", 64),
+            max_rounds=config.get("max_rounds", 3),
+            batch_size=config.get("batch_size", 8)
+        )
+
+    def get_batch_job_config(self) -> BatchJobConfig:
+        config = self.config.get("batch_jobs", {})
+        return BatchJobConfig(
+            jobs_dir=config.get("jobs_dir", "artifacts/jobs"),
+            max_workers=config.get("max_workers", 1),
+            chunk_rows=config.get("chunk_rows", 256)
+        )
+
+    def get_dedup_config(self) -> DedupConfig:
+        config = self.config.get("dedup", {})
+        return DedupConfig(
+            enabled=config.get("enabled", False),
+            similarity_threshold=config.get("similarity_threshold", 0.9),
+            num_perm=config.get("num_perm", 64),
+            bands=config.get("bands", 16),
+            shingle_size=config.get("shingle_size", 3)
+        )
+
+    def get_pipeline_config(self) -> PipelineConfig:
+        config = self.config.get("pipeline", {})
+        return PipelineConfig(
+            manifest_path=config.get("manifest_path", "artifacts/pipeline/manifest.json")
+        )
+
+    def get_benchmark_config(self) -> BenchmarkConfig:
+        config = self.config.get("benchmark", {})
+        serving = self.get_serving_config()
+        return BenchmarkConfig(
+            corpus_path=config.get("corpus_path", "requests.jsonl"),
+            output_dir=config.get("output_dir", "artifacts/benchmarks"),
+            targets=list(config.get("targets", ["direct", "app"])),
+            concurrency_levels=list(config.get("concurrency_levels", [1, 4, 8])),
+            num_requests=config.get("num_requests", 64),
+            warmup_requests=config.get("warmup_requests", 2),
+            model_path=config.get("model_path", serving.model_path),
+            backend=config.get("backend", serving.backend),
+            onnx_dir=config.get("onnx_dir", serving.onnx_dir),
+            regression_threshold=config.get("regression_threshold", 0.10)
         )
@@ -7,6 +7,11 @@ class DataIngestionConfig:
     source_URL: str
     local_data_file: Path
     unzip_dir: Path
+    sha256: str
+    cache_dir: str
+    download_segments: int
+    members: list
+    extract_workers: int
 
 @dataclass
 class DataTransformationConfig:
@@ -14,6 +19,19 @@ class DataTransformationConfig:
     train_path: str
     test_path: str
     val_path: str
+    chunk_size: int
+    num_workers: int
+    output_formats: list
+    drop_duplicates: bool
+    normalize_whitespace: bool
+
+@dataclass
+class DataTokenizationConfig:
+    root_dir: str
+    tokenizer_name: str
+    max_input_length: int
+    max_target_length: int
+    num_proc: int
 
 @dataclass
 class ModelTrainerConfig:
@@ -31,3 +49,126 @@ class ModelTrainerConfig:
     eval_steps: int
     save_steps: int
     gradient_accumulation_steps: int
+    length_efficient: bool
+    max_tokens_per_batch: int
+
+@dataclass
+class DecodingPolicy:
+    name: str
+    strategy: str  # greedy | beam | sample
+    num_beams: int = 4
+    length_penalty: float = 1.0
+    top_k: int = 50
+    top_p: float = 1.0
+    temperature: float = 1.0
+    fallback: str = None  # cheaper policy to use when a deadline is at risk
+
+@dataclass
+class DecodingConfig:
+    default_policy: str
+    batch_policy: str
+    deep_queue: int
+    long_input_tokens: int
+    policies: dict
+
+@dataclass
+class ModelEvaluationConfig:
+    root_dir: str
+    model_path: str
+    data_path: str
+    predictions_dir: str
+    num_workers: int
+    batch_size: int
+    chunk_size: int
+    max_input_length: int
+    max_length: int
+    num_beams: int
+    length_penalty: float
+    decoding: DecodingPolicy
+
+@dataclass
+class ModelSpec:
+    model_path: str
+    backend: str
+    onnx_dir: str
+
+@dataclass
+class ServingConfig:
+    model_path: str
+    backend: str
+    onnx_dir: str
+    default_model: str
+    models: dict
+    memory_budget_mb: float
+    watch_interval_seconds: float
+    load_mode: str
+    warmup_requests: int
+    max_batch_size: int
+    max_wait_ms: float
+    max_queue_size: int
+    inference_workers: int
+    max_pending: int
+    csv_batch_size: int
+    csv_chunk_rows: int
+    host: str
+    port: int
+    workers: int
+    threads_per_worker: int
+    pin_cpus: bool
+
+@dataclass
+class TokenizerConfig:
+    require_fast: bool
+    num_threads: int
+    shard_size: int
+
+@dataclass
+class SummaryCacheConfig:
+    enabled: bool
+    max_entries: int
+    max_bytes: int
+    disk_path: str
+
+@dataclass
+class EncoderCacheConfig:
+    enabled: bool
+    max_entries: int
+    max_bytes: int
+
+@dataclass
+class LongDocumentConfig:
+    chunk_tokens: int
+    overlap_tokens: int
+    max_rounds: int
+    batch_size: int
+
+@dataclass
+class BatchJobConfig:
+    jobs_dir: str
+    max_workers: int
+    chunk_rows: int
+
+@dataclass
+class DedupConfig:
+    enabled: bool
+    similarity_threshold: float
+    num_perm: int
+    bands: int
+    shingle_size: int
+
+@dataclass
+class PipelineConfig:
+    manifest_path: str
+
+@dataclass
+class BenchmarkConfig:
+    corpus_path: str
+    output_dir: str
+    targets: list
+    concurrency_levels: list
+    num_requests: int
+    warmup_requests: int
+    model_path: str
+    backend: str
+    onnx_dir: str
+    regression_threshold: float
@@ -1,22 +1,182 @@
-import os 
+import os
 import sys
+import atexit
+import copy
+import contextvars
+import json
 import logging
+import logging.handlers
+import queue
+import random
+import time
+
+import yaml
+
+from src.summarizer.constants import CONFIG_FILE_PATH
 
-log_dir="logs"
 logging_str="[%(asctime)s:  %(levelname)s:%(module)s:%(message)s]"
 
-log_filepath=os.path.join(log_dir,"continious_logs.logs")
+# Settings come from the `logging` section of config.yaml. It is read directly
+# here because ConfigurationManager itself logs, so it cannot be used yet.
+DEFAULT_SETTINGS = {
+    "dir": "logs",
+    "file": "continious_logs.logs",
+    "level": "INFO",
+    "format": "text",  # text | json
+    "async": True,  # QueueHandler on the caller, file/stdout I/O on a listener thread
+    "rotation": "size",  # size | time | none
+    "max_bytes": 10 * 1024 * 1024,
+    "backup_count": 5,
+    "when": "midnight",
+    "request_sample_rate": 1.0,
+    "slow_request_ms": 1000,
+}
+
+
+def _load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        with open(CONFIG_FILE_PATH) as f:
+            settings.update((yaml.safe_load(f) or {}).get("logging") or {})
+    except OSError:
+        pass
+    return settings
+
+
+# ---------- request context ----------
+# Set per request by the API middleware; every record logged while handling
+# that request carries the id, including from inference executor threads,
+# which run calls in a copy of the submitting context
+request_id_var = contextvars.ContextVar("request_id", default=None)
+
+
+class RequestContextFilter(logging.Filter):
+    def filter(self, record):
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    # Keeps a `rate` fraction of high-volume records. Warnings and errors, and
+    # records whose duration_ms reaches slow_ms, are always kept.
+    def __init__(self, rate=1.0, slow_ms=None):
+        super().__init__()
+        self.rate = rate
+        self.slow_ms = slow_ms
+
+    def filter(self, record):
+        if self.rate >= 1.0 or record.levelno >= logging.WARNING:
+            return True
+        duration = getattr(record, "duration_ms", None)
+        if self.slow_ms is not None and duration is not None and duration >= self.slow_ms:
+            return True
+        return random.random() < self.rate
+
+
+# ---------- formatting ----------
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        payload = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+                    + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "message": record.getMessage(),
+        }
+        # Anything passed through `extra=` (request_id, duration_ms, ...)
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS and value is not None:
+                payload[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+        return json.dumps(payload, default=str)
+
+
+class _StructuredQueueHandler(logging.handlers.QueueHandler):
+    # The stock prepare() flattens the record into a preformatted string; keep
+    # it structured so the listener's formatter still sees extras, and only
+    # render the traceback (which cannot cross threads reliably)
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _file_handler(settings, path):
+    if settings["rotation"] == "size":
+        return logging.handlers.RotatingFileHandler(
+            path, maxBytes=int(settings["max_bytes"]), backupCount=int(settings["backup_count"]),
+            encoding="utf-8"
+        )
+    if settings["rotation"] == "time":
+        return logging.handlers.TimedRotatingFileHandler(
+            path, when=settings["when"], backupCount=int(settings["backup_count"]), encoding="utf-8"
+        )
+    return logging.FileHandler(path, encoding="utf-8")
+
+
+def setup_logging(settings=None, file_suffix=""):
+    # file_suffix gives each prefork worker its own file: rotating one file
+    # from several processes would lose records
+    global _configured_pid
+    settings = settings or _load_settings()
+    log_dir = settings["dir"]
+    os.makedirs(log_dir, exist_ok=True)
+    log_filepath = os.path.join(log_dir, settings["file"] + file_suffix)
+
+    formatter = JsonFormatter() if settings["format"] == "json" else logging.Formatter(logging_str)
+    handlers = [_file_handler(settings, log_filepath), logging.StreamHandler(sys.stdout)]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    root.setLevel(settings["level"])
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+    listener = None
+    if settings["async"]:
+        queue_handler = _StructuredQueueHandler(queue.SimpleQueue())
+        queue_handler.addFilter(RequestContextFilter())
+        root.addHandler(queue_handler)
+        listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        listener.start()
+        # Drain whatever is still queued before the interpreter exits
+        atexit.register(listener.stop)
+    else:
+        for handler in handlers:
+            handler.addFilter(RequestContextFilter())
+            root.addHandler(handler)
+
+    request_logger.filters.clear()
+    request_logger.addFilter(SamplingFilter(float(settings["request_sample_rate"]), settings["slow_request_ms"]))
+    _configured_pid = os.getpid()
+    return listener
+
+
+def configure_logging():
+    # Called by the entry points (app.py, serve.py, main.py, ...) rather than
+    # on import, so importing the package (tests, the benchmark) neither
+    # starts a listener thread nor writes to the log file. Only the first
+    # call in a process sets logging up, e.g. when serve.py imports app.py.
+    if _configured_pid != os.getpid():
+        setup_logging()
+
 
-os.makedirs(log_dir,exist_ok=True)
+logger =logging.getLogger("summarizerlogger")
 
-logging.basicConfig(
-    level=logging.INFO,
-    format=logging_str,
-    
-    handlers=[
-        logging.FileHandler(log_filepath),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Per-request access log; sampled according to logging.request_sample_rate
+request_logger = logging.getLogger("summarizerlogger.requests")
 
-logger =logging.getLogger("summarizerlogger")
\ No newline at end of file
+_configured_pid = None  # process that last ran setup_logging
@@ -0,0 +1,45 @@
+from src.summarizer.config.configuration import ConfigurationManager
+from src.summarizer.components.data_transformation import DataTransformation
+from src.summarizer.components.tokenized_store import TokenizedDatasetStore
+from src.summarizer.components.tokenization import load_tokenizer
+from src.summarizer.logging import logger
+
+
+class DataTokenizationTrainingPipeline:
+    def __init__(self):
+        pass
+
+    def initiate_data_tokenization(self):
+        config_manager = ConfigurationManager()
+        tokenization_config = config_manager.get_data_tokenization_config()
+        transformation_config = config_manager.get_data_transformation_config()
+        trainer_config = config_manager.get_model_trainer_config()
+        evaluation_config = config_manager.get_model_evaluation_config()
+
+        tokenizer = load_tokenizer(tokenization_config.tokenizer_name,
+                                   require_fast=config_manager.get_tokenizer_config().require_fast)
+
+        # Same settings the trainer and the evaluation stage use, so their
+        # lookups hit these entries instead of re-tokenizing
+        train_store = TokenizedDatasetStore(
+            tokenization_config.root_dir,
+            tokenizer,
+            max_input_length=tokenization_config.max_input_length,
+            max_target_length=tokenization_config.max_target_length,
+            padding=False if trainer_config.length_efficient else "max_length",
+            num_proc=tokenization_config.num_proc
+        )
+        data_transformation = DataTransformation(transformation_config)
+        train_store.load("train", data_transformation.split_path("train"))
+        train_store.load("eval", data_transformation.split_path("test"))
+
+        eval_store = TokenizedDatasetStore(
+            tokenization_config.root_dir,
+            tokenizer,
+            max_input_length=evaluation_config.max_input_length,
+            max_target_length=tokenization_config.max_target_length,
+            num_proc=tokenization_config.num_proc
+        )
+        eval_store.load("validation", evaluation_config.data_path, keep_columns=("summary",))
+
+        logger.info("Data Tokenization completed successfully.")
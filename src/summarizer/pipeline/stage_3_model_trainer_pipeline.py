@@ -1,4 +1,5 @@
 from src.summarizer.config.configuration import ConfigurationManager
+from src.summarizer.components.data_transformation import DataTransformation
 from src.summarizer.components.model_trainer import ModelTrainer
 from src.summarizer.logging import logger
 
@@ -14,11 +15,14 @@ class ModelTrainerTrainingPipeline:
             config_manager = ConfigurationManager()
             model_trainer_config = config_manager.get_model_trainer_config()
             data_transformation_config = config_manager.get_data_transformation_config()
+            data_tokenization_config = config_manager.get_data_tokenization_config()
 
-            train_path = data_transformation_config.train_path
-            eval_path = data_transformation_config.test_path
+            # The cleaned and deduplicated splits from the transformation stage
+            data_transformation = DataTransformation(data_transformation_config)
+            train_path = data_transformation.split_path("train")
+            eval_path = data_transformation.split_path("test")
 
-            model_trainer = ModelTrainer(config=model_trainer_config)
+            model_trainer = ModelTrainer(config=model_trainer_config, tokenization_config=data_tokenization_config)
             model_trainer.train(train_path=train_path, eval_path=eval_path)
 
             logger.info("✅ Model training completed successfully.")
@@ -0,0 +1,17 @@
+from src.summarizer.config.configuration import ConfigurationManager
+from src.summarizer.components.model_export import ModelExporter
+from src.summarizer.logging import logger
+
+
+class ModelExportPipeline:
+    def __init__(self):
+        pass
+
+    def initiate_model_export(self):
+        config_manager = ConfigurationManager()
+        serving_config = config_manager.get_serving_config()
+
+        exporter = ModelExporter(model_path=serving_config.model_path, onnx_dir=serving_config.onnx_dir)
+        exporter.export_onnx()
+
+        logger.info("Model export completed successfully.")
@@ -0,0 +1,135 @@
+# src/summarizer/pipeline/stage_runner.py
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+
+from src.summarizer.logging import logger
+
+
+@dataclass
+class Stage:
+    name: str
+    run: object  # zero-argument callable
+    config_sections: list = field(default_factory=list)
+    use_params: bool = False
+    inputs: list = field(default_factory=list)  # upstream files/directories
+    outputs: list = field(default_factory=list)
+
+
+def _plain(value):
+    # ConfigBox sections -> plain dicts so they serialize and compare cleanly
+    return value.to_dict() if hasattr(value, "to_dict") else value
+
+
+# Runs pipeline stages in order and skips any stage whose inputs (config
+# sections, params.yaml, upstream artifact hashes) match the last successful
+# run recorded in the manifest and whose outputs are still on disk unchanged.
+# A stage that re-runs changes its outputs' hashes, which in turn invalidates
+# every stage downstream of it.
+class StageRunner:
+    def __init__(self, manifest_path, config, params=None):
+        self.manifest_path = manifest_path
+        self.config = config
+        self.params = params
+        self.manifest = {"stages": {}, "files": {}}
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                self.manifest = json.load(f)
+        self.report = []
+
+    # ---------- hashing ----------
+    def _file_hash(self, path):
+        # sha256 of the content, reused from the manifest while size and mtime
+        # are unchanged so unchanged multi-GB artifacts are not re-read
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        cached = self.manifest["files"].get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            return cached["sha256"]
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        sha = digest.hexdigest()
+        self.manifest["files"][key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha}
+        return sha
+
+    def path_hash(self, path):
+        if os.path.isfile(path):
+            return self._file_hash(path)
+        if not os.path.isdir(path):
+            return None
+        digest = hashlib.sha256()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                digest.update(f"{os.path.relpath(file_path, path)}:{self._file_hash(file_path)}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _stage_inputs(self, stage):
+        return {
+            "config": {section: _plain(self.config.get(section)) for section in stage.config_sections},
+            "params": _plain(self.params) if stage.use_params else None,
+            "inputs": {path: self.path_hash(path) for path in stage.inputs},
+        }
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    # ---------- running ----------
+    def is_up_to_date(self, stage, inputs):
+        record = self.manifest["stages"].get(stage.name)
+        if record is None or record["inputs"] != inputs:
+            return False
+        return all(sha is not None and self.path_hash(path) == sha for path, sha in record["outputs"].items())
+
+    def run(self, stage, force=False):
+        started = time.perf_counter()
+        inputs = self._stage_inputs(stage)
+        if not force and self.is_up_to_date(stage, inputs):
+            elapsed = time.perf_counter() - started
+            logger.info(f">>>>>> Stage: {stage.name} is up to date, skipping <<<<<<")
+            self.report.append((stage.name, "skipped", elapsed))
+            self._save()
+            return False
+
+        logger.info(f">>>>>> Stage: {stage.name} started <<<<<<")
+        # Forget the old record first: a stage that fails halfway must run again
+        self.manifest["stages"].pop(stage.name, None)
+        self._save()
+        try:
+            stage.run()
+        except Exception as e:
+            logger.exception(f"Error in {stage.name}: {e}")
+            self.report.append((stage.name, "failed", time.perf_counter() - started))
+            raise e
+
+        elapsed = time.perf_counter() - started
+        self.manifest["stages"][stage.name] = {
+            "inputs": inputs,
+            "outputs": {path: self.path_hash(path) for path in stage.outputs},
+            "seconds": round(elapsed, 3),
+            "finished_at": time.time(),
+        }
+        self._save()
+        logger.info(f">>>>>> Stage: {stage.name} completed in {elapsed:.1f}s <<<<<<\n\nx==========x")
+        self.report.append((stage.name, "ran", elapsed))
+        return True
+
+    def run_all(self, stages, force=()):
+        force = set(force)
+        for stage in stages:
+            self.run(stage, force="all" in force or stage.name in force)
+        self.log_report()
+
+    def log_report(self):
+        lines = [f"{name:<24} {status:<8} {seconds:8.2f}s" for name, status, seconds in self.report]
+        total = sum(seconds for _, _, seconds in self.report)
+        logger.info("Pipeline timing:\n" + "\n".join(lines) + f"\n{'total':<24} {'':<8} {total:8.2f}s")
@@ -0,0 +1,25 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    # A randomly initialised two-layer T5 with a word-level tokenizer, small
+    # enough to load and generate with in milliseconds
+    torch = pytest.importorskip("torch")
+    transformers = pytest.importorskip("transformers")
+    from tokenizers import Tokenizer, models, pre_tokenizers, processors
+
+    vocab = {"<pad>": 0, "</s>": 1, "<unk>": 2, **{f"w{i}": i + 3 for i in range(200)}}
+    tokenizer = Tokenizer(models.WordLevel(vocab, unk_token="<unk>"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    tokenizer.post_processor = processors.TemplateProcessing(single="$A </s>", special_tokens=[("</s>", 1)])
+    fast = transformers.PreTrainedTokenizerFast(tokenizer_object=tokenizer, pad_token="<pad>", eos_token="</s>",
+                                                unk_token="<unk>")
+
+    torch.manual_seed(0)
+    config = transformers.T5Config(vocab_size=len(vocab), d_model=32, d_ff=64, num_layers=2, num_heads=2, d_kv=16,
+                                   decoder_start_token_id=0, pad_token_id=0, eos_token_id=1)
+    path = tmp_path_factory.mktemp("tiny_model")
+    transformers.T5ForConditionalGeneration(config).save_pretrained(path)
+    fast.save_pretrained(path)
+    return str(path)
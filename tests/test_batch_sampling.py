@@ -0,0 +1,41 @@
+import random
+
+from src.summarizer.components.batch_sampling import TokenBudgetBatchSampler
+
+
+def make_sampler(**kwargs):
+    rng = random.Random(0)
+    lengths = [rng.randint(5, 300) for _ in range(500)]
+    return lengths, TokenBudgetBatchSampler(lengths, max_tokens=1024, window_size=100, **kwargs)
+
+
+def test_len_matches_every_epoch():
+    _, sampler = make_sampler()
+    expected = len(sampler)
+    for _ in range(4):
+        assert len(list(sampler)) == expected
+        assert len(sampler) == expected
+
+
+def test_every_index_once_within_budget():
+    lengths, sampler = make_sampler()
+    batches = list(sampler)
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) == 1 or max(lengths[i] for i in batch) * len(batch) <= 1024
+
+
+def test_batch_order_changes_per_epoch_and_follows_set_epoch():
+    _, sampler = make_sampler()
+    first, second = list(sampler), list(sampler)
+    assert first != second
+
+    sampler.set_epoch(0)
+    assert list(sampler) == first
+
+
+def test_without_shuffle_keeps_length_order():
+    lengths, sampler = make_sampler(shuffle=False)
+    assert list(sampler) == list(sampler)
+    for batch in sampler:
+        assert [lengths[i] for i in batch] == sorted(lengths[i] for i in batch)
@@ -0,0 +1,54 @@
+import pytest
+
+from src.summarizer.components.decoding import DecodingPolicies, UnknownPolicyError
+from src.summarizer.entity.dataingestionconfig import DecodingConfig, DecodingPolicy
+
+
+def make_policies(**overrides):
+    policies = {
+        "beam4": DecodingPolicy(name="beam4", strategy="beam", num_beams=4, fallback="beam2"),
+        "beam2": DecodingPolicy(name="beam2", strategy="beam", num_beams=2, fallback="greedy"),
+        "greedy": DecodingPolicy(name="greedy", strategy="greedy"),
+        "sample": DecodingPolicy(name="sample", strategy="sample", top_p=0.9, fallback="greedy"),
+        "beam_only": DecodingPolicy(name="beam_only", strategy="beam"),
+    }
+    settings = {"default_policy": "beam4", "batch_policy": "beam4", "deep_queue": 16, "long_input_tokens": 768,
+                **overrides}
+    return DecodingPolicies(DecodingConfig(policies=policies, **settings))
+
+
+def test_no_deadline_keeps_the_requested_policy():
+    policies = make_policies()
+    assert policies.resolve(queue_depth=100, input_tokens=10000) == (policies.get("beam4"), None)
+    with pytest.raises(UnknownPolicyError):
+        policies.resolve("nope")
+
+
+def test_deep_queue_or_long_input_steps_down_once():
+    policies = make_policies()
+    policy, reason = policies.resolve(deadline_ms=500, queue_depth=16)
+    assert (policy.name, reason) == ("beam2", "queue_depth=16")
+    policy, reason = policies.resolve(deadline_ms=500, input_tokens=800)
+    assert (policy.name, reason) == ("beam2", "input_tokens=800")
+
+
+def test_recent_latency_walks_the_fallback_chain():
+    policies = make_policies()
+    policies.observe("beam4", 2.0)
+    policies.observe("beam2", 0.9)
+    policy, reason = policies.resolve(deadline_ms=1000)
+    assert policy.name == "beam2"
+    assert reason == "beam4 estimated 2000ms > deadline 1000ms"
+
+    policy, _ = policies.resolve(deadline_ms=1000, queue_depth=8, max_batch_size=8)
+    assert policy.name == "greedy"
+
+
+def test_streaming_skips_beam_policies():
+    policies = make_policies()
+    policy, reason = policies.resolve(streaming=True)
+    assert policy.name == "greedy"
+    assert "beam4 uses beam search" in reason and "beam2 uses beam search" in reason
+    assert policies.resolve("sample", streaming=True) == (policies.get("sample"), None)
+    with pytest.raises(ValueError, match="no streamable fallback"):
+        policies.resolve("beam_only", streaming=True)
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.summarizer.components import downloader
+from src.summarizer.components.downloader import DownloadError, Downloader
+
+CONTENT = os.urandom(64 * 1024)
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    # Serves self.server.content; honours Range unless ranges is False (or,
+    # with ranges == "probe", only for the first byte), hides the total size
+    # unless size_known, and cuts the next `truncate` body responses off
+    # halfway through
+    def do_GET(self):
+        server = self.server
+        content = server.content
+        start, end, status = 0, len(content) - 1, 200
+        header = self.headers.get("Range")
+        if header and (server.ranges is True or (server.ranges == "probe" and header == "bytes=0-0")):
+            first, last = header[len("bytes="):].split("-")
+            start, end, status = int(first), int(last) if last else len(content) - 1, 206
+        server.requests.append(header)
+        body = content[start:end + 1]
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        if status == 206:
+            total = len(content) if server.size_known else "*"
+            self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+        self.end_headers()
+        with server.lock:
+            truncate = server.truncate > 0 and len(body) > 1
+            server.truncate -= truncate
+        self.wfile.write(body[:len(body) // 2] if truncate else body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+    httpd.content, httpd.etag, httpd.ranges, httpd.truncate = CONTENT, '"v1"', True, 0
+    httpd.requests, httpd.lock, httpd.size_known = [], threading.Lock(), True
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(downloader, "BLOCK_SIZE", 1024)
+    monkeypatch.setattr(downloader.time, "sleep", lambda seconds: None)
+
+
+def url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}/data.zip"
+
+
+def make_downloader(tmp_path, **kwargs):
+    kwargs = {"num_segments": 4, "min_segment_bytes": 4096, "timeout": 5, **kwargs}
+    return Downloader(cache_dir=str(tmp_path / "cache"), **kwargs)
+
+
+def test_segmented_download_is_verified_and_cached(server, tmp_path):
+    dest = tmp_path / "data.zip"
+    sha = hashlib.sha256(CONTENT).hexdigest()
+    make_downloader(tmp_path).fetch(url(server), str(dest), sha256=sha)
+
+    assert dest.read_bytes() == CONTENT
+    assert len([r for r in server.requests if r != "bytes=0-0"]) == 4
+    assert (tmp_path / "cache" / sha).exists()
+    assert not (tmp_path / "data.zip.part").exists()
+
+
+def test_falls_back_to_one_stream_without_range_support(server, tmp_path):
+    server.ranges = False
+    dest = tmp_path / "data.zip"
+    make_downloader(tmp_path).fetch(url(server), str(dest), sha256=hashlib.sha256(CONTENT).hexdigest())
+    assert dest.read_bytes() == CONTENT
+
+
+def test_resumes_an_interrupted_download(server, tmp_path):
+    dest = tmp_path / "data.zip"
+    server.truncate = 4
+    with pytest.raises(DownloadError):
+        make_downloader(tmp_path, retries=1).fetch(url(server), str(dest))
+    with open(tmp_path / "data.zip.part.json") as f:
+        saved = json.load(f)["segments"]
+    assert all(0 < done < end - start + 1 for start, end, done in saved)
+
+    server.requests.clear()
+    make_downloader(tmp_path).fetch(url(server), str(dest))
+    assert dest.read_bytes() == CONTENT
+    resumed_from = sorted(int(r[len("bytes="):].split("-")[0]) for r in server.requests if r != "bytes=0-0")
+    assert resumed_from == sorted(start + done for start, _, done in saved)
+
+
+def test_stream_resume_answered_with_the_full_body_starts_over(server, tmp_path):
+    server.ranges, server.size_known = "probe", False
+    dest = tmp_path / "data.zip"
+    (tmp_path / "data.zip.part").write_bytes(CONTENT[:5000])
+
+    make_downloader(tmp_path).fetch(url(server), str(dest), sha256=hashlib.sha256(CONTENT).hexdigest())
+    assert server.requests == ["bytes=0-0", "bytes=5000-"]
+    assert dest.read_bytes() == CONTENT
+
+
+def test_checksum_mismatch_discards_the_download(server, tmp_path):
+    dest = tmp_path / "data.zip"
+    with pytest.raises(DownloadError, match="Checksum mismatch"):
+        make_downloader(tmp_path).fetch(url(server), str(dest), sha256="0" * 64)
+    assert not dest.exists()
+    assert not (tmp_path / "data.zip.part").exists()
+
+
+def test_cached_copy_is_revalidated_against_the_server(server, tmp_path):
+    dest = tmp_path / "data.zip"
+    make_downloader(tmp_path).fetch(url(server), str(dest))
+
+    server.requests.clear()
+    make_downloader(tmp_path).fetch(url(server), str(dest))
+    assert server.requests == ["bytes=0-0"]
+
+    server.content, server.etag = CONTENT[::-1], '"v2"'
+    make_downloader(tmp_path).fetch(url(server), str(dest))
+    assert dest.read_bytes() == CONTENT[::-1]
@@ -0,0 +1,73 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from src.summarizer.components.encoder_cache import EncoderCache  # noqa: E402
+
+
+def words(start, count):
+    # Text in the tiny model's vocabulary
+    return " ".join(f"w{(start + i) % 200}" for i in range(count))
+
+
+def test_key_depends_on_model_and_tokens():
+    key = EncoderCache.make_key("model-a", [5, 6, 7])
+    assert key == EncoderCache.make_key("model-a", [5, 6, 7])
+    assert key != EncoderCache.make_key("model-b", [5, 6, 7])
+    assert key != EncoderCache.make_key("model-a", [5, 6])
+
+
+def test_evicts_least_recently_used_within_limits():
+    cache = EncoderCache(max_entries=2)
+    cache.put("a", torch.zeros(3, 4))
+    cache.put("b", torch.ones(3, 4))
+    cache.get("a")
+    cache.put("c", torch.ones(3, 4))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    entry_bytes = 3 * 4 * 4
+    cache = EncoderCache(max_entries=10, max_bytes=2 * entry_bytes)
+    for key in "xyz":
+        cache.put(key, torch.zeros(3, 4))
+    assert cache.stats()["bytes"] == 2 * entry_bytes
+    assert cache.get("x") is None
+
+
+def test_stores_a_copy_and_skips_oversized_entries():
+    cache = EncoderCache(max_bytes=1024)
+    batch = torch.zeros(2, 3, 4)
+    cache.put("row", batch[0])
+    batch += 1
+    assert torch.equal(cache.get("row"), torch.zeros(3, 4))
+
+    cache.put("big", torch.zeros(100, 100))
+    assert cache.get("big") is None
+
+
+def test_cached_encoder_outputs_give_identical_summaries(tiny_model_dir):
+    from src.summarizer.components.model_prediction import ModelPrediction
+
+    plain = ModelPrediction(model_path=tiny_model_dir)
+    cached = ModelPrediction(model_path=tiny_model_dir, encoder_cache=EncoderCache())
+    assert cached.reuses_encoder
+    texts = [words(0, 12), words(40, 5), words(80, 30), words(0, 12)]
+    kwargs = {"batch_size": 3, "max_length": 12, "min_length": 2}
+
+    expected = plain.summarize_batch(texts, **kwargs)
+    assert cached.summarize_batch(texts, **kwargs) == expected
+    # Second pass: every encoder output comes from the cache
+    misses = cached.encoder_cache.misses
+    assert cached.summarize_batch(texts, **kwargs) == expected
+    assert cached.encoder_cache.misses == misses
+
+
+def test_variants_match_separate_calls(tiny_model_dir):
+    from src.summarizer.components.model_prediction import ModelPrediction
+
+    predictor = ModelPrediction(model_path=tiny_model_dir, encoder_cache=EncoderCache())
+    text = words(10, 20)
+    variants = [(8, 2), (16, 4)]
+    expected = [predictor.summarize(text, max_length=max_length, min_length=min_length)
+                for max_length, min_length in variants]
+    assert predictor.summarize_variants(text, variants) == expected
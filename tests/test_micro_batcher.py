@@ -0,0 +1,112 @@
+import asyncio
+import threading
+import time
+
+from src.summarizer.components.inference_executor import InferenceExecutor
+from src.summarizer.components.micro_batcher import MicroBatcher
+
+
+class SlowPredictor:
+    model_id = "slow"
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.batches = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def summarize_batch(self, texts, batch_size, max_length, min_length, input_ids=None, **generate_kwargs):
+        with self._lock:
+            self.batches.append(list(texts))
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.running -= 1
+        return [text.upper() for text in texts]
+
+
+def run_requests(predictor, workers, texts, max_batch_size=2):
+    executor = InferenceExecutor(max_workers=workers, max_pending=16)
+    batcher = MicroBatcher(lambda model: predictor, executor, max_batch_size=max_batch_size, max_wait_ms=5)
+
+    async def main():
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.summarize(text) for text in texts))
+        finally:
+            await batcher.stop()
+
+    try:
+        return asyncio.run(main())
+    finally:
+        executor.shutdown()
+
+
+def test_batches_generate_concurrently_up_to_the_worker_count():
+    predictor = SlowPredictor(0.2)
+    texts = [f"t{i}" for i in range(8)]
+    started = time.perf_counter()
+    assert run_requests(predictor, workers=4, texts=texts) == [text.upper() for text in texts]
+    assert predictor.max_running > 1
+    assert predictor.max_running <= 4
+    assert time.perf_counter() - started < 0.2 * len(predictor.batches)
+
+
+def test_one_worker_runs_one_batch_at_a_time():
+    predictor = SlowPredictor(0.05)
+    texts = [f"t{i}" for i in range(6)]
+    assert run_requests(predictor, workers=1, texts=texts) == [text.upper() for text in texts]
+    assert predictor.max_running == 1
+    assert all(len(batch) <= 2 for batch in predictor.batches)
+
+
+def test_a_failed_batch_fails_only_its_requests():
+    class FlakyPredictor(SlowPredictor):
+        def summarize_batch(self, texts, *args, **kwargs):
+            if "bad" in texts:
+                raise RuntimeError("boom")
+            return super().summarize_batch(texts, *args, **kwargs)
+
+    predictor = FlakyPredictor(0.01)
+    executor = InferenceExecutor(max_workers=2, max_pending=16)
+    batcher = MicroBatcher(lambda model: predictor, executor, max_batch_size=1, max_wait_ms=1)
+
+    async def main():
+        await batcher.start()
+        try:
+            return await asyncio.gather(batcher.summarize("bad"), batcher.summarize("good"),
+                                        return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    try:
+        bad, good = asyncio.run(main())
+    finally:
+        executor.shutdown()
+    assert isinstance(bad, RuntimeError)
+    assert good == "GOOD"
+
+
+def test_on_generated_reports_generate_time_once_per_batch():
+    predictor = SlowPredictor(0.1)
+    executor = InferenceExecutor(max_workers=1, max_pending=16)
+    batcher = MicroBatcher(lambda model: predictor, executor, max_batch_size=2, max_wait_ms=20)
+    observed = []
+
+    async def main():
+        await batcher.start()
+        try:
+            await asyncio.gather(*(batcher.summarize(f"t{i}", on_generated=observed.append) for i in range(6)))
+        finally:
+            await batcher.stop()
+
+    try:
+        asyncio.run(main())
+    finally:
+        executor.shutdown()
+    # Three batches of two, queued behind each other on one worker: each
+    # reports its own generate time, not the time it waited
+    assert len(observed) == len(predictor.batches) == 3
+    assert all(0.09 < seconds < 0.18 for seconds in observed)
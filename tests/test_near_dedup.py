@@ -0,0 +1,77 @@
+from src.summarizer.components.near_dedup import ClusterSummarizer, NearDuplicateIndex, normalize_text, plan_clusters
+
+BASE = ("Customer: my order 4417 arrived damaged and the box was open. Agent: sorry to hear that, "
+        "I have issued a replacement which ships tomorrow with tracking by email.")
+
+
+def test_normalization_ignores_case_punctuation_and_metadata_timestamps():
+    stamped = "[2024-03-01 10:15:00] Anna: Hi,  THERE!!\n[2024-03-01 10:16:02] Bob: ok 2024-03-01T10:16:02Z"
+    other = "5/6/24 9:30 pm anna: hi there\n9:31 PM bob: ok 2024-05-06T21:31:00+02:00"
+    assert normalize_text(stamped) == normalize_text(other) == "anna hi there bob ok"
+    assert normalize_text("hi there") != normalize_text("hi where")
+
+
+def test_times_inside_a_turn_are_content():
+    first = "Anna: can we meet at 10:30 tomorrow?\nBob: sure, see you then"
+    second = "Anna: can we meet at 4:00 tomorrow?\nBob: sure, see you then"
+    assert normalize_text(first) != normalize_text(second)
+    index = NearDuplicateIndex(threshold=0.8)
+    assert index.add(first) != index.add(second)
+
+
+def test_exact_and_near_duplicates_share_a_cluster():
+    index = NearDuplicateIndex(threshold=0.8)
+    first = index.add(BASE)
+    assert index.add(BASE.upper().replace(",", " ,")) == first
+    assert index.add(BASE.replace("by email", "by mail")) == first
+    assert index.add("Customer: how do I reset my password? Agent: use the link on the login page.") != first
+    assert (index.exact_duplicates, index.near_duplicates) == (1, 1)
+
+
+def test_threshold_one_only_merges_exact_matches():
+    index = NearDuplicateIndex(threshold=1.0)
+    assert index.add(BASE) != index.add(BASE.replace("tomorrow", "today"))
+
+
+def test_plan_tracks_the_last_row_of_each_cluster():
+    plan = plan_clusters([BASE, "something else entirely", BASE.lower(), "something else entirely"])
+    assert plan.clusters == [0, 1, 0, 1]
+    assert plan.last_row == {0: 2, 1: 3}
+    assert plan.stats() == {"rows": 4, "unique": 2, "exact_duplicates": 2, "near_duplicates": 0}
+
+
+class RecordingSummarizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [f"summary of {text[:12]}" for text in texts]
+
+
+ROWS = ["a b c d", "e f g h", "A B C D!", "i j k l", "e f g h", "a b c d", "m n o p"]
+
+
+def test_each_cluster_is_summarized_once_across_chunks():
+    plan = plan_clusters(ROWS)
+    model = RecordingSummarizer()
+    summarizer = ClusterSummarizer(plan, model)
+    output = summarizer(ROWS[:3]) + summarizer(ROWS[3:5]) + summarizer(ROWS[5:])
+
+    assert model.calls == [["a b c d", "e f g h"], ["i j k l"], ["m n o p"]]
+    assert output[2] == output[5] == output[0]
+    assert output[4] == output[1]
+    assert (summarizer.generations, summarizer.generations_saved) == (4, 3)
+    assert summarizer._summaries == {}
+
+
+def test_resume_regenerates_clusters_started_before_the_restart():
+    plan = plan_clusters(ROWS)
+    full = ClusterSummarizer(plan, RecordingSummarizer())
+    expected = full(ROWS[:4]) + full(ROWS[4:])
+
+    model = RecordingSummarizer()
+    resumed = ClusterSummarizer(plan, model, start_row=4)
+    assert resumed(ROWS[4:]) == expected[4:]
+    assert model.calls == [["e f g h", "a b c d", "m n o p"]]
+    assert resumed.rows_served == 3
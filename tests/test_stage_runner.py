@@ -0,0 +1,87 @@
+import pytest
+
+from src.summarizer.pipeline.stage_runner import Stage, StageRunner
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_text("raw data")
+    return tmp_path, source, tmp_path / "out.txt"
+
+
+def make_stage(source, output, calls, config_sections=("step",)):
+    def run():
+        calls.append(1)
+        output.write_text(source.read_text().upper())
+
+    return Stage(name="step", run=run, config_sections=list(config_sections), inputs=[str(source)],
+                 outputs=[str(output)])
+
+
+def make_runner(tmp_path, config=None, params=None):
+    return StageRunner(str(tmp_path / "manifest.json"), config or {"step": {"size": 1}}, params)
+
+
+def test_skips_a_stage_that_is_up_to_date(workspace):
+    tmp_path, source, output = workspace
+    calls = []
+    assert make_runner(tmp_path).run(make_stage(source, output, calls)) is True
+    assert make_runner(tmp_path).run(make_stage(source, output, calls)) is False
+    assert len(calls) == 1
+
+
+def test_reruns_when_its_config_section_changes(workspace):
+    tmp_path, source, output = workspace
+    calls = []
+    make_runner(tmp_path).run(make_stage(source, output, calls))
+    make_runner(tmp_path, {"step": {"size": 1}, "other": 2}).run(make_stage(source, output, calls))
+    assert len(calls) == 1
+
+    make_runner(tmp_path, {"step": {"size": 2}}).run(make_stage(source, output, calls))
+    assert len(calls) == 2
+
+
+def test_reruns_when_an_input_or_output_changes(workspace):
+    tmp_path, source, output = workspace
+    calls = []
+    make_runner(tmp_path).run(make_stage(source, output, calls))
+
+    source.write_text("new raw data")
+    make_runner(tmp_path).run(make_stage(source, output, calls))
+    assert len(calls) == 2
+
+    output.unlink()
+    make_runner(tmp_path).run(make_stage(source, output, calls))
+    assert len(calls) == 3
+
+
+def test_failed_stage_runs_again(workspace):
+    tmp_path, source, output = workspace
+    calls = []
+    make_runner(tmp_path).run(make_stage(source, output, calls))
+
+    def fail():
+        raise RuntimeError("boom")
+
+    broken = Stage(name="step", run=fail, config_sections=["step"], inputs=[str(source)], outputs=[str(output)])
+    with pytest.raises(RuntimeError):
+        make_runner(tmp_path, {"step": {"size": 2}}).run(broken)
+    make_runner(tmp_path).run(make_stage(source, output, calls))
+    assert len(calls) == 2
+
+
+def test_force_reruns_and_params_are_tracked(workspace):
+    tmp_path, source, output = workspace
+    calls = []
+    stage = make_stage(source, output, calls)
+    stage.use_params = True
+    make_runner(tmp_path, params={"lr": 1}).run(stage)
+
+    runner = make_runner(tmp_path, params={"lr": 1})
+    runner.run_all([stage], force=["step"])
+    assert len(calls) == 2
+    assert [status for _, status, _ in runner.report] == ["ran"]
+
+    make_runner(tmp_path, params={"lr": 2}).run(stage)
+    assert len(calls) == 3
@@ -0,0 +1,71 @@
+import os
+
+from src.summarizer.components.summary_cache import SummaryCache
+
+
+def test_key_ignores_whitespace_but_not_model_or_params():
+    key = SummaryCache.make_key("hello   world\n", "model-a", max_length=64)
+    assert key == SummaryCache.make_key(" hello world", "model-a", max_length=64)
+    assert key != SummaryCache.make_key("hello world", "model-b", max_length=64)
+    assert key != SummaryCache.make_key("hello world", "model-a", max_length=32)
+
+
+def test_evicts_least_recently_used_entry():
+    cache = SummaryCache(max_entries=2)
+    cache.put("a", "summary a")
+    cache.put("b", "summary b")
+    assert cache.get("a") == "summary a"
+    cache.put("c", "summary c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "summary a"
+    assert cache.get("c") == "summary c"
+
+
+def test_evicts_to_stay_within_byte_budget():
+    cache = SummaryCache(max_entries=100, max_bytes=30)
+    cache.put("k1", "x" * 10)
+    cache.put("k2", "y" * 10)
+    cache.put("k3", "z" * 10)
+
+    assert cache.stats()["bytes"] <= 30
+    assert cache.get("k1") is None
+    assert cache.get("k3") == "z" * 10
+
+
+def test_skips_entries_larger_than_the_budget():
+    cache = SummaryCache(max_bytes=8)
+    cache.put("key", "far too long a summary")
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_disk_tier_survives_a_new_instance(tmp_path):
+    path = str(tmp_path / "cache" / "summaries.db")
+    SummaryCache(disk_path=path).put("key", "summary")
+
+    cache = SummaryCache(disk_path=path)
+    assert cache.get("key") == "summary"
+    assert cache.get("other") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["disk_hits"], stats["misses"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_forked_child_opens_its_own_connection(tmp_path):
+    cache = SummaryCache(disk_path=str(tmp_path / "summaries.db"))
+    cache.put("parent", "from the parent")
+    parent_db = cache._db
+
+    pid = os.fork()
+    if pid == 0:
+        ok = False
+        try:
+            cache.put("child", "from the child")
+            ok = cache._db is not parent_db and cache.get("parent") == "from the parent"
+        finally:
+            os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert SummaryCache(disk_path=str(tmp_path / "summaries.db")).get("child") == "from the child"
@@ -0,0 +1,62 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("transformers")
+
+from src.summarizer.components.tokenization import TokenizationService, load_tokenizer  # noqa: E402
+
+
+def texts(count, start=0):
+    return [" ".join(f"w{(start + i + j) % 200}" for j in range(5 + (i * 7) % 40)) for i in range(count)]
+
+
+@pytest.fixture
+def tokenizer(tiny_model_dir):
+    tokenizer = load_tokenizer(tiny_model_dir, require_fast=True)
+    assert tokenizer.is_fast
+    return tokenizer
+
+
+def test_sharded_encoding_matches_one_call(tokenizer):
+    service = TokenizationService(tokenizer, num_threads=4, shard_size=8)
+    batch = texts(50)
+    assert service.encode(batch, max_length=16, truncation=True) == dict(tokenizer(batch, max_length=16,
+                                                                                   truncation=True))
+    assert service.submit(batch[:3]).result() == dict(tokenizer(batch[:3]))
+
+
+def test_concurrent_calls_with_different_settings(tokenizer):
+    # Alternating truncation lengths and special tokens reconfigure the Rust
+    # tokenizer on every call; on one shared object this raises "Already borrowed"
+    service = TokenizationService(tokenizer, num_threads=4, shard_size=4)
+    settings = [{"max_length": n, "truncation": True, "add_special_tokens": n % 2 == 0} for n in (4, 9, 16, 33)]
+    expected = [dict(load_tokenizer(tokenizer.name_or_path)(texts(3, n), **settings[n % 4])) for n in range(40)]
+
+    def call(n):
+        if n % 3 == 0:
+            return service.submit(texts(3, n), **settings[n % 4]).result()
+        if n % 3 == 1:
+            return service.encode(texts(3, n), **settings[n % 4])
+        return dict(service.thread_tokenizer()(texts(3, n), **settings[n % 4]))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(5):
+            assert list(pool.map(call, range(40))) == expected
+
+
+def test_predictions_are_thread_safe(tiny_model_dir):
+    from src.summarizer.components.model_prediction import ModelPrediction
+
+    predictor = ModelPrediction(model_path=tiny_model_dir)
+    jobs = [(texts(2, n), 8 + n % 3 * 8) for n in range(12)]
+    expected = [predictor.summarize_batch(batch, max_length=6, min_length=1, max_input_length=max_input_length,
+                                          num_beams=1) for batch, max_input_length in jobs]
+
+    def call(job):
+        batch, max_input_length = job
+        return predictor.summarize_batch(batch, max_length=6, min_length=1, max_input_length=max_input_length,
+                                         num_beams=1)
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        assert list(pool.map(call, jobs)) == expected